@@ -10,17 +10,52 @@ Checks:
 
 import os
 import re
+import sys
 import json
 import time
+import shutil
+import tempfile
+import queue
+import logging
+import threading
 import requests
+from logging.handlers import QueueHandler, QueueListener
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime, timedelta
+from urllib.parse import quote
 from pathlib import Path
 from dotenv import load_dotenv
-from azure.identity import ClientSecretCredential
 from collections import defaultdict
+from dataclasses import dataclass, asdict
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import zstandard as zstd
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
 
 load_dotenv()
 
+# All console output goes through one queued logger so fetch loops never
+# block on terminal I/O and messages reach stdout in the order they were
+# emitted; a background listener writes them out
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+logger.propagate = False
+_log_queue = queue.Queue()
+logger.addHandler(QueueHandler(_log_queue))
+_console_handler = logging.StreamHandler(sys.stdout)
+_console_handler.setFormatter(logging.Formatter('%(message)s'))
+_log_listener = QueueListener(_log_queue, _console_handler)
+
 # Configuration
 TENANT_ID = os.getenv('AZURE_TENANT_ID', '187b2af6-1bfb-490a-85dd-b720fe3d31bc')
 CLIENT_ID = os.getenv('AZURE_CLIENT_ID')
@@ -50,38 +85,145 @@ CHECKIN_KEYWORDS = [
     'shey x', 'louise x', 'kc x'
 ]
 
+# Name/email fragments identifying the target users
+TARGET_USER_KEYWORDS = ['shey', 'louise', 'kc', 'hr@', 'human resource']
+
+
+class KeywordMatcher:
+    """Case-insensitive substring matcher for a fixed keyword list"""
+    __slots__ = ('_re',)
+    
+    def __init__(self, keywords):
+        self._re = re.compile('|'.join(map(re.escape, keywords)), re.IGNORECASE)
+    
+    def match(self, name):
+        return self._re.search(name) is not None
+
+
+CHECKIN_MATCHER = KeywordMatcher(CHECKIN_KEYWORDS)
+TARGET_USER_MATCHER = KeywordMatcher(TARGET_USER_KEYWORDS)
+
 TRANSCRIPTS_DIR = Path('transcripts')
 RECORDINGS_DIR = Path('recordings')
 OUTPUT_DIR = Path('output')
 
+# Compress the results file to .json.zst only when asked to, so the default
+# output stays the plain JSON other scripts read
+COMPRESS_RESULTS = os.getenv('COMPRESS_RESULTS') == '1'
+
+# Cached Graph access token
+_token_cache = {'token': None, 'expires_at': 0}
+
+# Meeting subject cache (meeting_id -> subject), persisted between runs
+MEETING_SUBJECTS_CACHE = OUTPUT_DIR / 'meeting_subjects.json'
+MEETING_SUBJECTS_TTL_HOURS = 24
+_meeting_subject_cache = {}
+
+# Transcript IDs already saved locally, persisted between runs
+DOWNLOADED_TRANSCRIPTS_FILE = OUTPUT_DIR / 'downloaded_transcripts.json'
+_downloaded_transcript_ids = set()
+
+# Set once Graph rejects the expanded onlineMeetings query, so later users go
+# straight to getAllTranscripts instead of repeating a failing call
+_expand_query = {'rejected': False}
+
+
+def parse_json(resp):
+    """Decode a Graph response body, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(resp.content)
+    return resp.json()
+
+
+@dataclass(slots=True)
+class CheckinMeeting:
+    """Calendar check-in meeting recorded in the search results"""
+    subject: str
+    start: str
+    organizer: str
+    user: str
+    is_online: bool
+
+
+class RateLimiter:
+    """Simple token bucket: allow `rate` calls per `per` seconds"""
+    
+    def __init__(self, rate=10, per=1.0):
+        self.rate = rate
+        self.per = per
+        self.allowance = rate
+        self.last_check = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        with self.lock:
+            now = time.monotonic()
+            self.allowance = min(self.rate, self.allowance + (now - self.last_check) * self.rate / self.per)
+            self.last_check = now
+            if self.allowance < 1:
+                time.sleep((1 - self.allowance) * self.per / self.rate)
+                self.last_check = time.monotonic()
+                self.allowance = 0
+            else:
+                self.allowance -= 1
+
+
+def create_session(headers):
+    """Create a pooled Graph session that retries throttled and failed requests"""
+    session = requests.Session()
+    retry_strategy = Retry(
+        total=5,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+    )
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=retry_strategy)
+    session.mount("https://", adapter)
+    session.headers.update(headers)
+    return session
+
 
 def get_auth_token():
-    """Get authentication token for Graph API"""
-    credential = ClientSecretCredential(TENANT_ID, CLIENT_ID, CLIENT_SECRET)
-    token = credential.get_token('https://graph.microsoft.com/.default').token
-    return token
+    """Get authentication token for Graph API (client credentials flow)"""
+    if _token_cache['token'] and time.time() + 60 < _token_cache['expires_at']:
+        return _token_cache['token']
+    
+    resp = requests.post(
+        f'https://login.microsoftonline.com/{TENANT_ID}/oauth2/v2.0/token',
+        data={
+            'client_id': CLIENT_ID,
+            'client_secret': CLIENT_SECRET,
+            'scope': 'https://graph.microsoft.com/.default',
+            'grant_type': 'client_credentials'
+        },
+        timeout=30
+    )
+    resp.raise_for_status()
+    data = parse_json(resp)
+    _token_cache['token'] = data['access_token']
+    _token_cache['expires_at'] = time.time() + int(data.get('expires_in', 3600))
+    return _token_cache['token']
 
 
-def get_all_users(headers):
+def get_all_users(session):
     """Get all users from the tenant"""
-    print("\n🔍 Fetching all users from tenant...")
+    logger.info("\n🔍 Fetching all users from tenant...")
     users = []
     url = "https://graph.microsoft.com/v1.0/users?$select=id,displayName,mail,userPrincipalName&$top=999"
     
     try:
-        resp = requests.get(url, headers=headers, timeout=60)
+        resp = session.get(url, timeout=60)
         if resp.status_code == 200:
-            data = resp.json()
+            data = parse_json(resp)
             users = data.get('value', [])
-            print(f"   Found {len(users)} users")
+            logger.info(f"   Found {len(users)} users")
             
             # Look for HR, Shey, Louise, KC
             target_found = []
             for user in users:
-                name = (user.get('displayName') or '').lower()
-                email = (user.get('mail') or user.get('userPrincipalName') or '').lower()
+                name = user.get('displayName') or ''
+                email = user.get('mail') or user.get('userPrincipalName') or ''
                 
-                if any(k in name or k in email for k in ['shey', 'louise', 'kc', 'hr@', 'human resource']):
+                if TARGET_USER_MATCHER.match(name) or TARGET_USER_MATCHER.match(email):
                     target_found.append({
                         'id': user.get('id'),
                         'name': user.get('displayName'),
@@ -89,354 +231,528 @@ def get_all_users(headers):
                     })
             
             if target_found:
-                print(f"\n   🎯 Found target users:")
+                logger.info(f"\n   🎯 Found target users:")
                 for u in target_found:
-                    print(f"      - {u['name']} ({u['email']}) - ID: {u['id']}")
+                    logger.info(f"      - {u['name']} ({u['email']}) - ID: {u['id']}")
                     TARGET_USERS[u['name'].lower()] = u['id']
         else:
-            print(f"   ❌ Error: {resp.status_code} - {resp.text[:200]}")
+            logger.info(f"   ❌ Error: {resp.status_code} - {resp.text[:200]}")
     except Exception as e:
-        print(f"   ❌ Error: {e}")
+        logger.info(f"   ❌ Error: {e}")
     
     return users
 
 
-def get_user_calendar_events(headers, user_id, user_name, days_back=60):
+def get_user_calendar_events(session, user_id, user_name, days_back=60):
     """Get calendar events for a user"""
     events = []
     start_date = (datetime.utcnow() - timedelta(days=days_back)).strftime('%Y-%m-%dT00:00:00Z')
     end_date = datetime.utcnow().strftime('%Y-%m-%dT23:59:59Z')
     
-    print(f"\n📅 Fetching calendar events for {user_name}...")
+    logger.info(f"\n📅 Fetching calendar events for {user_name}...")
     
     url = f"https://graph.microsoft.com/v1.0/users/{user_id}/calendar/calendarView?startDateTime={start_date}&endDateTime={end_date}&$top=500&$select=subject,start,end,organizer,isOnlineMeeting,onlineMeetingUrl"
     
+    # Push the keyword filter to Graph so only candidate events come back
+    filter_expr = " or ".join(f"contains(tolower(subject),'{kw}')" for kw in CHECKIN_KEYWORDS)
+    filtered_url = f"{url}&$filter={quote(filter_expr)}"
+    
     try:
-        resp = requests.get(url, headers=headers, timeout=60)
+        resp = session.get(filtered_url, timeout=60)
+        if resp.status_code == 400:
+            # Server-side filter rejected; fall back to filtering client-side
+            resp = session.get(url, timeout=60)
         if resp.status_code == 200:
-            data = resp.json()
+            data = parse_json(resp)
             events = data.get('value', [])
-            print(f"   Found {len(events)} calendar events")
+            logger.info(f"   Found {len(events)} calendar events")
             
             # Filter for check-in meetings
             checkin_events = []
             for event in events:
-                subject = (event.get('subject') or '').lower()
-                if any(kw in subject for kw in CHECKIN_KEYWORDS):
+                if CHECKIN_MATCHER.match(event.get('subject') or ''):
                     checkin_events.append(event)
             
-            print(f"   🎯 Check-in meetings: {len(checkin_events)}")
+            logger.info(f"   🎯 Check-in meetings: {len(checkin_events)}")
             return events, checkin_events
         else:
-            print(f"   ⚠️ Error: {resp.status_code}")
+            logger.info(f"   ⚠️ Error: {resp.status_code}")
     except Exception as e:
-        print(f"   ❌ Error: {e}")
+        logger.info(f"   ❌ Error: {e}")
     
     return [], []
 
 
-def get_all_transcripts_from_api(headers, user_id, user_name, days_back=60):
+def get_transcripts_with_subjects(session, user_id, user_name, cutoff_iso):
+    """Get transcripts and meeting subjects in one pass via $expand=transcripts.
+    
+    Returns None when Graph rejects the query so the caller can fall back.
+    """
+    # Only meetings created since the cutoff are listed, so a recurring series
+    # created earlier is left to the getAllTranscripts fallback; the
+    # transcripts are dated individually below as well
+    url = (f"https://graph.microsoft.com/beta/users/{user_id}/onlineMeetings"
+           f"?$filter=creationDateTime ge {cutoff_iso}&$expand=transcripts&$select=id,subject")
+    all_transcripts = []
+    
+    while url:
+        resp = session.get(url, timeout=60)
+        if resp.status_code != 200:
+            return None
+        data = parse_json(resp)
+        
+        for meeting in data.get('value', []):
+            meeting_id = meeting.get('id', '')
+            subject = meeting.get('subject')
+            if subject:
+                # Only real subjects go into the shared cache, not the placeholder
+                _meeting_subject_cache[meeting_id] = subject
+            else:
+                subject = 'Unknown Meeting'
+            
+            for t in meeting.get('transcripts') or []:
+                created_date = t.get('createdDateTime', '')
+                if created_date and created_date >= cutoff_iso:
+                    t.setdefault('meetingId', meeting_id)
+                    t['subject'] = subject
+                    t['user_id'] = user_id
+                    t['user_name'] = user_name
+                    all_transcripts.append(t)
+        
+        url = data.get('@odata.nextLink')
+    
+    return all_transcripts
+
+
+def get_all_transcripts_from_api(session, user_id, user_name, days_back=60):
     """Get all transcripts for a user from Graph API"""
     all_transcripts = []
-    cutoff_date = datetime.utcnow() - timedelta(days=days_back)
+    # Graph returns UTC timestamps as YYYY-MM-DDTHH:MM:SS...Z, which sort lexicographically
+    cutoff_iso = (datetime.utcnow() - timedelta(days=days_back)).strftime('%Y-%m-%dT%H:%M:%SZ')
+    
+    logger.info(f"\n📝 Fetching transcripts for {user_name}...")
+    
+    # Preferred path: meetings with transcripts expanded, so subjects come inline
+    if not _expand_query['rejected']:
+        try:
+            expanded = get_transcripts_with_subjects(session, user_id, user_name, cutoff_iso)
+        except Exception:
+            expanded = None
+        if expanded is not None:
+            logger.info(f"   ✅ Found {len(expanded)} transcripts in last {days_back} days")
+            return expanded
+        _expand_query['rejected'] = True
     
-    print(f"\n📝 Fetching transcripts for {user_name}...")
     url = f"https://graph.microsoft.com/beta/users/{user_id}/onlineMeetings/getAllTranscripts(meetingOrganizerUserId='{user_id}')"
     
     page_count = 0
     recent_count = 0
-    
-    while url:
-        try:
-            resp = requests.get(url, headers=headers, timeout=60)
-            if resp.status_code == 200:
-                data = resp.json()
-                transcripts = data.get('value', [])
-                
-                for t in transcripts:
-                    created_date = t.get('createdDateTime', '')
-                    if created_date:
-                        try:
-                            created = datetime.fromisoformat(created_date.replace('Z', '+00:00'))
-                            if created.replace(tzinfo=None) >= cutoff_date:
-                                t['user_id'] = user_id
-                                t['user_name'] = user_name
-                                all_transcripts.append(t)
-                                recent_count += 1
-                        except:
-                            pass
-                
-                page_count += 1
-                url = data.get('@odata.nextLink')
-                
-                if page_count % 5 == 0:
-                    print(f"   📄 Processed {page_count} pages, {recent_count} recent transcripts...")
-                
-                time.sleep(0.3)
-            else:
-                print(f"   ⚠️ Error: {resp.status_code}")
-                break
-        except requests.exceptions.Timeout:
-            print(f"   ⚠️ Timeout, continuing...")
-            break
-        except Exception as e:
-            print(f"   ❌ Error: {e}")
-            break
-    
-    print(f"   ✅ Found {len(all_transcripts)} transcripts in last {days_back} days")
+    rate_limiter = RateLimiter(rate=10, per=1.0)
+    
+    def fetch_page(page_url):
+        rate_limiter.acquire()
+        return session.get(page_url, timeout=60)
+    
+    # Fetch page N+1 in the background while page N is being processed
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(fetch_page, url)
+        while future:
+            try:
+                resp = future.result()
+                future = None
+                if resp.status_code == 200:
+                    data = parse_json(resp)
+                    next_url = data.get('@odata.nextLink')
+                    if next_url:
+                        future = executor.submit(fetch_page, next_url)
+                    
+                    for t in data.get('value', []):
+                        created_date = t.get('createdDateTime', '')
+                        if created_date and created_date >= cutoff_iso:
+                            t['user_id'] = user_id
+                            t['user_name'] = user_name
+                            all_transcripts.append(t)
+                            recent_count += 1
+                    
+                    page_count += 1
+                    
+                    if page_count % 5 == 0:
+                        logger.info(f"   📄 Processed {page_count} pages, {recent_count} recent transcripts...")
+                else:
+                    logger.info(f"   ⚠️ Error: {resp.status_code}")
+            except requests.exceptions.Timeout:
+                logger.info(f"   ⚠️ Timeout, continuing...")
+                future = None
+            except Exception as e:
+                logger.info(f"   ❌ Error: {e}")
+                future = None
+    
+    logger.info(f"   ✅ Found {len(all_transcripts)} transcripts in last {days_back} days")
     return all_transcripts
 
 
 def scan_local_recordings():
     """Scan local recordings folder for HR/Shey/Louise meetings"""
-    print("\n📁 Scanning local recordings folder...")
+    logger.info("\n📁 Scanning local recordings folder...")
     
     if not RECORDINGS_DIR.exists():
-        print("   ⚠️ Recordings folder not found")
-        return []
-    
-    recordings = []
-    checkin_recordings = []
+        logger.info("   ⚠️ Recordings folder not found")
+        return [], []
     
-    for folder in RECORDINGS_DIR.iterdir():
-        if folder.is_dir():
-            name = folder.name.lower()
-            recordings.append(folder.name)
-            
-            # Check if it's a check-in meeting
-            if any(kw in name for kw in CHECKIN_KEYWORDS):
-                checkin_recordings.append(folder.name)
+    # DirEntry.is_dir() uses the type returned by readdir, so no extra stat per folder
+    with os.scandir(RECORDINGS_DIR) as it:
+        recordings = [entry.name for entry in it if entry.is_dir()]
+    checkin_recordings = [name for name in recordings if CHECKIN_MATCHER.match(name)]
     
-    print(f"   Found {len(recordings)} total recordings")
-    print(f"   🎯 Check-in recordings: {len(checkin_recordings)}")
+    logger.info(f"   Found {len(recordings)} total recordings")
+    logger.info(f"   🎯 Check-in recordings: {len(checkin_recordings)}")
     
     return recordings, checkin_recordings
 
 
 def scan_local_transcripts():
     """Scan local transcripts folder"""
-    print("\n📝 Scanning local transcripts folder...")
+    logger.info("\n📝 Scanning local transcripts folder...")
     
     if not TRANSCRIPTS_DIR.exists():
-        print("   ⚠️ Transcripts folder not found")
+        logger.info("   ⚠️ Transcripts folder not found")
         return [], []
     
-    transcripts = []
     checkin_transcripts = []
-    cutoff_date = datetime.now() - timedelta(days=60)
+    cutoff_stamp = (datetime.now() - timedelta(days=60)).strftime('%Y%m%d')
     
-    for f in TRANSCRIPTS_DIR.glob('*.vtt'):
-        name = f.stem.lower()
-        transcripts.append(f.name)
+    with os.scandir(TRANSCRIPTS_DIR) as it:
+        transcripts = [entry.name for entry in it if entry.name.endswith('.vtt') and entry.is_file()]
+    
+    for filename in transcripts:
+        stem = filename[:-4]
         
-        # Check date from filename
-        try:
-            date_str = f.stem[:8]
-            file_date = datetime.strptime(date_str, '%Y%m%d')
-            if file_date >= cutoff_date:
-                if any(kw in name for kw in CHECKIN_KEYWORDS):
-                    checkin_transcripts.append(f.name)
-        except:
-            pass
+        # Check date from filename (YYYYMMDD prefix compares lexicographically)
+        date_str = stem[:8]
+        if date_str.isdigit() and date_str >= cutoff_stamp:
+            if CHECKIN_MATCHER.match(stem):
+                checkin_transcripts.append(filename)
     
-    print(f"   Found {len(transcripts)} total transcripts")
-    print(f"   🎯 Recent check-in transcripts (last 60 days): {len(checkin_transcripts)}")
+    logger.info(f"   Found {len(transcripts)} total transcripts")
+    logger.info(f"   🎯 Recent check-in transcripts (last 60 days): {len(checkin_transcripts)}")
     
     return transcripts, checkin_transcripts
 
 
-def get_meeting_details_and_download(headers, user_id, meeting_id, transcript_id, created_date):
-    """Get meeting details and download transcript if available"""
-    # Get meeting subject
+def load_meeting_subject_cache():
+    """Load cached meeting subjects from disk if the cache is still fresh"""
+    if not MEETING_SUBJECTS_CACHE.exists():
+        return
+    age = datetime.now() - datetime.fromtimestamp(MEETING_SUBJECTS_CACHE.stat().st_mtime)
+    if age > timedelta(hours=MEETING_SUBJECTS_TTL_HOURS):
+        return
+    try:
+        with open(MEETING_SUBJECTS_CACHE, 'r', encoding='utf-8') as f:
+            _meeting_subject_cache.update(json.load(f))
+        logger.info(f"   Loaded {len(_meeting_subject_cache)} cached meeting subjects")
+    except Exception as e:
+        logger.info(f"   ⚠️ Could not read meeting subject cache: {e}")
+
+
+def save_meeting_subject_cache():
+    """Persist cached meeting subjects for the next run"""
+    try:
+        with open(MEETING_SUBJECTS_CACHE, 'w', encoding='utf-8') as f:
+            json.dump(_meeting_subject_cache, f, indent=2)
+    except Exception as e:
+        logger.info(f"   ⚠️ Could not write meeting subject cache: {e}")
+
+
+def load_downloaded_transcripts():
+    """Load the set of transcript IDs already downloaded in previous runs"""
+    if not DOWNLOADED_TRANSCRIPTS_FILE.exists():
+        return
+    try:
+        with open(DOWNLOADED_TRANSCRIPTS_FILE, 'r', encoding='utf-8') as f:
+            _downloaded_transcript_ids.update(json.load(f))
+        logger.info(f"   Loaded {len(_downloaded_transcript_ids)} previously downloaded transcript IDs")
+    except Exception as e:
+        logger.info(f"   ⚠️ Could not read downloaded transcripts list: {e}")
+
+
+def save_downloaded_transcripts():
+    """Persist the set of downloaded transcript IDs for the next run"""
+    try:
+        with open(DOWNLOADED_TRANSCRIPTS_FILE, 'w', encoding='utf-8') as f:
+            json.dump(sorted(_downloaded_transcript_ids), f, indent=2)
+    except Exception as e:
+        logger.info(f"   ⚠️ Could not write downloaded transcripts list: {e}")
+
+
+def already_have(transcript_id):
+    """Check whether a transcript was already downloaded, without any network call"""
+    return bool(transcript_id) and transcript_id in _downloaded_transcript_ids
+
+
+def get_meeting_subject(session, user_id, meeting_id):
+    """Get a meeting subject, looking each meeting up at most once per run"""
+    subject = _meeting_subject_cache.get(meeting_id)
+    if subject:
+        return subject
+    
     meeting_url = f"https://graph.microsoft.com/beta/users/{user_id}/onlineMeetings/{meeting_id}"
     subject = "Unknown Meeting"
     
     try:
-        resp = requests.get(meeting_url, headers=headers, timeout=30)
+        resp = session.get(meeting_url, timeout=30)
         if resp.status_code == 200:
-            subject = resp.json().get('subject', 'Unknown Meeting')
+            subject = parse_json(resp).get('subject', 'Unknown Meeting')
+            _meeting_subject_cache[meeting_id] = subject
     except:
         pass
     
+    return subject
+
+
+def get_meeting_details_and_download(session, user_id, meeting_id, transcript_id, created_date):
+    """Get meeting details and download transcript if available"""
+    subject = get_meeting_subject(session, user_id, meeting_id)
+    
+    safe_subject = re.sub(r'[<>:"/\\|?*]', '', subject)[:50]
+    date_str = created_date[:10].replace('-', '') if created_date else datetime.now().strftime('%Y%m%d')
+    time_str = created_date[11:19].replace(':', '') if created_date and len(created_date) > 11 else ''
+    filename = f"{date_str}_{time_str}_{safe_subject}.vtt"
+    filepath = TRANSCRIPTS_DIR / filename
+    
     # Download transcript
     transcript_url = f"https://graph.microsoft.com/beta/users/{user_id}/onlineMeetings/{meeting_id}/transcripts/{transcript_id}/content?$format=text/vtt"
     
+    # Stream into a private temp file and only link it to the final name once
+    # complete, so an interrupted download never looks like a saved transcript.
+    # The link fails instead of overwriting if another run got there first.
+    tmp_path = None
     try:
-        resp = requests.get(transcript_url, headers=headers, timeout=60)
-        if resp.status_code == 200:
-            # Save transcript
-            safe_subject = re.sub(r'[<>:"/\\|?*]', '', subject)[:50]
-            date_str = created_date[:10].replace('-', '') if created_date else datetime.now().strftime('%Y%m%d')
-            time_str = created_date[11:19].replace(':', '') if created_date and len(created_date) > 11 else ''
-            filename = f"{date_str}_{time_str}_{safe_subject}.vtt"
-            filepath = TRANSCRIPTS_DIR / filename
-            
-            if not filepath.exists():
-                with open(filepath, 'w', encoding='utf-8') as f:
-                    f.write(resp.text)
-                return filename, subject, True
+        TRANSCRIPTS_DIR.mkdir(exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=TRANSCRIPTS_DIR, suffix='.part')
+        with os.fdopen(fd, 'wb') as f, session.get(transcript_url, stream=True, timeout=60) as resp:
+            if resp.status_code == 200:
+                # VTT from Graph is already UTF-8, so write the raw bytes
+                resp.raw.decode_content = True
+                shutil.copyfileobj(resp.raw, f, length=65536)
+                saved = True
             else:
-                return filename, subject, False  # Already exists
-        elif resp.status_code == 404:
-            return None, subject, False
+                saved = False
+        if saved:
+            os.chmod(tmp_path, 0o644)
+            try:
+                os.link(tmp_path, filepath)
+                is_new = True
+            except FileExistsError:
+                is_new = False  # Already exists
+            os.remove(tmp_path)
+            return filename, subject, is_new
     except:
         pass
     
+    if tmp_path:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
     return None, subject, False
 
 
+def dump_json_bytes(data):
+    """Serialize results to indented UTF-8 JSON bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2, default=str)
+    return json.dumps(data, indent=2, default=str).encode('utf-8')
+
+
+def save_results(results, output_file):
+    """Write results JSON, zstd-compressed (.json.zst) if COMPRESS_RESULTS is set"""
+    payload = dump_json_bytes(results)
+    if COMPRESS_RESULTS and ZSTD_AVAILABLE:
+        output_file = output_file.with_name(output_file.name + '.zst')
+        with open(output_file, 'wb') as raw, zstd.ZstdCompressor(level=3).stream_writer(raw) as f:
+            f.write(payload)
+    else:
+        output_file.write_bytes(payload)
+    return output_file
+
+
+def open_results(path):
+    """Load a saved results file, transparently decompressing .zst files"""
+    path = Path(path)
+    if path.suffix == '.zst':
+        with open(path, 'rb') as raw, zstd.ZstdDecompressor().stream_reader(raw) as f:
+            return json.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
 def main():
-    print("=" * 70)
-    print("COMPREHENSIVE MEETING SEARCH - HR, SHEY, LOUISE")
-    print("=" * 70)
-    print(f"Date Range: Last 60 days (since {(datetime.now() - timedelta(days=60)).strftime('%Y-%m-%d')})")
-    print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"Focus: Check-in meetings with Virtual Assistants")
-    
-    # Authenticate
-    print("\n🔗 Authenticating with Microsoft Graph...")
-    token = get_auth_token()
-    headers = {
-        'Authorization': f'Bearer {token}',
-        'Content-Type': 'application/json'
-    }
-    print("✅ Authenticated")
-    
-    results = {
-        'searched_at': datetime.now().isoformat(),
-        'date_range_days': 60,
-        'users_found': [],
-        'api_transcripts': [],
-        'calendar_events': [],
-        'checkin_meetings': [],
-        'local_recordings': [],
-        'local_transcripts': [],
-        'new_downloads': [],
-        'summary': {}
-    }
-    
-    # Step 1: Get all users to find target users
-    all_users = get_all_users(headers)
-    results['users_found'] = list(TARGET_USERS.keys())
-    
-    # Step 2: Scan local files first
-    local_recordings, checkin_recordings = scan_local_recordings()
-    local_transcripts, checkin_local_transcripts = scan_local_transcripts()
-    
-    results['local_recordings'] = checkin_recordings
-    results['local_transcripts'] = checkin_local_transcripts
-    
-    # Step 3: Get transcripts from API for each target user
-    all_api_transcripts = []
-    new_downloads = []
-    
-    for user_name, user_id in TARGET_USERS.items():
-        print(f"\n{'='*50}")
-        print(f"Processing: {user_name.upper()}")
-        print(f"{'='*50}")
+    _log_listener.start()
+    try:
+        logger.info("=" * 70)
+        logger.info("COMPREHENSIVE MEETING SEARCH - HR, SHEY, LOUISE")
+        logger.info("=" * 70)
+        logger.info(f"Date Range: Last 60 days (since {(datetime.now() - timedelta(days=60)).strftime('%Y-%m-%d')})")
+        logger.info(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        logger.info(f"Focus: Check-in meetings with Virtual Assistants")
         
-        # Get calendar events
-        all_events, checkin_events = get_user_calendar_events(headers, user_id, user_name, days_back=60)
+        # Authenticate
+        logger.info("\n🔗 Authenticating with Microsoft Graph...")
+        token = get_auth_token()
+        headers = {
+            'Authorization': f'Bearer {token}',
+            'Content-Type': 'application/json'
+        }
+        session = create_session(headers)
+        logger.info("✅ Authenticated")
         
-        for event in checkin_events[:20]:  # Log first 20
-            results['checkin_meetings'].append({
-                'subject': event.get('subject'),
-                'start': event.get('start', {}).get('dateTime'),
-                'organizer': event.get('organizer', {}).get('emailAddress', {}).get('name'),
-                'user': user_name,
-                'is_online': event.get('isOnlineMeeting')
-            })
+        load_meeting_subject_cache()
+        load_downloaded_transcripts()
         
-        # Get transcripts from API
-        transcripts = get_all_transcripts_from_api(headers, user_id, user_name, days_back=60)
-        all_api_transcripts.extend(transcripts)
+        results = {
+            'searched_at': datetime.now().isoformat(),
+            'date_range_days': 60,
+            'users_found': [],
+            'api_transcripts': [],
+            'calendar_events': [],
+            'checkin_meetings': [],
+            'local_recordings': [],
+            'local_transcripts': [],
+            'new_downloads': [],
+            'summary': {}
+        }
         
-        # Try to download new transcripts
-        print(f"\n   🔄 Checking for downloadable transcripts...")
-        downloaded = 0
-        skipped = 0
-        not_available = 0
+        # Step 1: Get all users to find target users
+        all_users = get_all_users(session)
+        results['users_found'] = list(TARGET_USERS.keys())
         
-        for t in transcripts[:100]:  # Check first 100
-            transcript_id = t.get('id', '')
-            meeting_id = t.get('meetingId', '')
-            created_date = t.get('createdDateTime', '')
+        # Step 2: Scan local files first
+        local_recordings, checkin_recordings = scan_local_recordings()
+        local_transcripts, checkin_local_transcripts = scan_local_transcripts()
+        
+        results['local_recordings'] = checkin_recordings
+        results['local_transcripts'] = checkin_local_transcripts
+        
+        # Step 3: Get transcripts from API for each target user
+        all_api_transcripts = []
+        new_downloads = []
+        
+        for user_name, user_id in TARGET_USERS.items():
+            logger.info(f"\n{'='*50}")
+            logger.info(f"Processing: {user_name.upper()}")
+            logger.info(f"{'='*50}")
             
-            filename, subject, is_new = get_meeting_details_and_download(
-                headers, user_id, meeting_id, transcript_id, created_date
-            )
+            # Get calendar events
+            all_events, checkin_events = get_user_calendar_events(session, user_id, user_name, days_back=60)
             
-            if filename and is_new:
-                downloaded += 1
-                new_downloads.append({
-                    'filename': filename,
-                    'subject': subject,
-                    'date': created_date,
-                    'user': user_name
-                })
-                print(f"      ✅ Downloaded: {subject[:40]}...")
-            elif filename:
-                skipped += 1
-            else:
-                not_available += 1
+            for event in checkin_events[:20]:  # Log first 20
+                organizer = ((event.get('organizer') or {}).get('emailAddress') or {}).get('name')
+                results['checkin_meetings'].append(CheckinMeeting(
+                    subject=event.get('subject'),
+                    start=(event.get('start') or {}).get('dateTime'),
+                    organizer=organizer,
+                    user=user_name,
+                    is_online=event.get('isOnlineMeeting')
+                ))
+            
+            # Get transcripts from API
+            transcripts = get_all_transcripts_from_api(session, user_id, user_name, days_back=60)
+            all_api_transcripts.extend(transcripts)
+            
+            # Try to download new transcripts
+            logger.info(f"\n   🔄 Checking for downloadable transcripts...")
+            downloaded = 0
+            skipped = 0
+            not_available = 0
+            
+            for t in transcripts[:100]:  # Check first 100
+                transcript_id = t.get('id', '')
+                meeting_id = t.get('meetingId', '')
+                created_date = t.get('createdDateTime', '')
+                
+                if already_have(transcript_id):
+                    skipped += 1
+                    continue
+                
+                filename, subject, is_new = get_meeting_details_and_download(
+                    session, user_id, meeting_id, transcript_id, created_date
+                )
+                
+                if filename:
+                    _downloaded_transcript_ids.add(transcript_id)
+                
+                if filename and is_new:
+                    downloaded += 1
+                    new_downloads.append({
+                        'filename': filename,
+                        'subject': subject,
+                        'date': created_date,
+                        'user': user_name
+                    })
+                    logger.info(f"      ✅ Downloaded: {subject[:40]}...")
+                elif filename:
+                    skipped += 1
+                else:
+                    not_available += 1
             
-            time.sleep(0.3)
+            logger.info(f"   📊 Downloaded: {downloaded}, Skipped (exists): {skipped}, Not available: {not_available}")
+        
+        results['new_downloads'] = new_downloads
+        save_meeting_subject_cache()
+        save_downloaded_transcripts()
+        
+        # Summary
+        logger.info("\n" + "=" * 70)
+        logger.info("SUMMARY")
+        logger.info("=" * 70)
+        
+        logger.info(f"\n📊 Users searched: {', '.join(TARGET_USERS.keys())}")
+        logger.info(f"\n📅 Calendar check-in meetings found: {len(results['checkin_meetings'])}")
+        logger.info(f"📝 API transcripts (last 60 days): {len(all_api_transcripts)}")
+        logger.info(f"📁 Local check-in recordings: {len(checkin_recordings)}")
+        logger.info(f"📄 Local check-in transcripts: {len(checkin_local_transcripts)}")
+        logger.info(f"🆕 Newly downloaded: {len(new_downloads)}")
+        
+        # List recent check-in meetings
+        logger.info(f"\n📋 Recent Check-in Meetings (from calendar):")
+        for meeting in sorted(results['checkin_meetings'], key=lambda m: m.start or '', reverse=True)[:20]:
+            date = meeting.start[:10] if meeting.start else 'Unknown'
+            logger.info(f"   - [{date}] {(meeting.subject or 'No subject')[:60]}")
+        
+        # List newly downloaded
+        if new_downloads:
+            logger.info(f"\n✨ Newly Downloaded Transcripts:")
+            for t in new_downloads:
+                date = t.get('date', '')[:10] if t.get('date') else 'Unknown'
+                logger.info(f"   - [{date}] {t.get('subject', 'Unknown')[:60]}")
+        
+        # List local check-in recordings without transcripts
+        logger.info(f"\n📁 Check-in Recordings (local folder) - Sample:")
+        for rec in sorted(checkin_recordings, reverse=True)[:15]:
+            logger.info(f"   - {rec[:70]}")
+        
+        results['summary'] = {
+            'users_searched': list(TARGET_USERS.keys()),
+            'calendar_checkins': len(results['checkin_meetings']),
+            'api_transcripts': len(all_api_transcripts),
+            'local_checkin_recordings': len(checkin_recordings),
+            'local_checkin_transcripts': len(checkin_local_transcripts),
+            'new_downloads': len(new_downloads)
+        }
+        
+        # Save results
+        results['checkin_meetings'] = [asdict(m) for m in results['checkin_meetings']]
+        output_file = OUTPUT_DIR / f'meeting_search_results_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
+        output_file = save_results(results, output_file)
+        
+        logger.info(f"\n💾 Full results saved to: {output_file}")
         
-        print(f"   📊 Downloaded: {downloaded}, Skipped (exists): {skipped}, Not available: {not_available}")
-    
-    results['new_downloads'] = new_downloads
-    
-    # Summary
-    print("\n" + "=" * 70)
-    print("SUMMARY")
-    print("=" * 70)
-    
-    print(f"\n📊 Users searched: {', '.join(TARGET_USERS.keys())}")
-    print(f"\n📅 Calendar check-in meetings found: {len(results['checkin_meetings'])}")
-    print(f"📝 API transcripts (last 60 days): {len(all_api_transcripts)}")
-    print(f"📁 Local check-in recordings: {len(checkin_recordings)}")
-    print(f"📄 Local check-in transcripts: {len(checkin_local_transcripts)}")
-    print(f"🆕 Newly downloaded: {len(new_downloads)}")
-    
-    # List recent check-in meetings
-    print(f"\n📋 Recent Check-in Meetings (from calendar):")
-    for meeting in sorted(results['checkin_meetings'], key=lambda x: x.get('start', ''), reverse=True)[:20]:
-        date = meeting.get('start', '')[:10] if meeting.get('start') else 'Unknown'
-        print(f"   - [{date}] {meeting.get('subject', 'No subject')[:60]}")
-    
-    # List newly downloaded
-    if new_downloads:
-        print(f"\n✨ Newly Downloaded Transcripts:")
-        for t in new_downloads:
-            date = t.get('date', '')[:10] if t.get('date') else 'Unknown'
-            print(f"   - [{date}] {t.get('subject', 'Unknown')[:60]}")
-    
-    # List local check-in recordings without transcripts
-    print(f"\n📁 Check-in Recordings (local folder) - Sample:")
-    for rec in sorted(checkin_recordings, reverse=True)[:15]:
-        print(f"   - {rec[:70]}")
-    
-    results['summary'] = {
-        'users_searched': list(TARGET_USERS.keys()),
-        'calendar_checkins': len(results['checkin_meetings']),
-        'api_transcripts': len(all_api_transcripts),
-        'local_checkin_recordings': len(checkin_recordings),
-        'local_checkin_transcripts': len(checkin_local_transcripts),
-        'new_downloads': len(new_downloads)
-    }
-    
-    # Save results
-    output_file = OUTPUT_DIR / f'meeting_search_results_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(results, f, indent=2, default=str)
-    
-    print(f"\n💾 Full results saved to: {output_file}")
-    
-    # Final count
-    total_transcripts = len(list(TRANSCRIPTS_DIR.glob('*.vtt')))
-    print(f"\n📊 Total transcripts now: {total_transcripts}")
-    
-    return results
+        # Final count
+        total_transcripts = len(list(TRANSCRIPTS_DIR.glob('*.vtt')))
+        logger.info(f"\n📊 Total transcripts now: {total_transcripts}")
+        return results
+    finally:
+        _log_listener.stop()
 
 
 if __name__ == "__main__":
@@ -8,14 +8,20 @@ This script:
 4. Saves transcripts in VTT format
 
 Requirements:
-- FFmpeg installed (for audio extraction)
+- FFmpeg installed (for audio decoding)
 - Azure Speech Service configured (AZURE_SPEECH_KEY in .env)
 """
 
 import os
 import sys
+import asyncio
 import requests
 import time
+import queue
+import shutil
+import threading
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime
 from pathlib import Path
 from azure.identity import ClientSecretCredential
@@ -23,6 +29,15 @@ from dotenv import load_dotenv
 import subprocess
 import logging
 import re
+import sqlite3
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
 
 # Setup logging
 logging.basicConfig(
@@ -51,6 +66,34 @@ SPEECH_REGION = os.getenv('AZURE_SPEECH_REGION', 'eastus')
 RECORDINGS_DIR = Path('recordings')
 TRANSCRIPTS_DIR = Path('transcripts')
 LOGS_DIR = Path('logs')
+RECORDINGS_DB = LOGS_DIR / 'recordings.db'
+
+# Drive delta fields; later runs apply only what changed in each user's drive
+DELTA_FIELDS = 'id,name,createdDateTime,size,parentReference,deleted'
+
+# Concurrent Graph requests when scanning users' OneDrive folders
+SCAN_WORKERS = 32
+
+# Graph JSON batching accepts at most 20 sub-requests per $batch call
+GRAPH_BATCH_SIZE = 20
+
+# Read size when streaming recordings to disk
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Worker threads per pipeline stage (download -> ffmpeg-fed Azure STT)
+DOWNLOAD_WORKERS = 2
+TRANSCRIBE_WORKERS = 2
+
+# Azure Batch Transcription polling
+BATCH_POLL_SECONDS = 30
+BATCH_TIMEOUT_SECONDS = 3 * 60 * 60
+# Result files are named after the position of their URL in contentUrls;
+# the 'source' field can't be matched because Azure strips the SAS query
+_BATCH_RESULT_RE = re.compile(r'contenturl_(\d+)\.json$', re.IGNORECASE)
+
+# Filename helpers
+_UNSAFE_FN_RE = re.compile(r'[<>:"/\\|?*]')
+_DATE_RE = re.compile(r'(\d{8}_\d{6})')
 
 # Ensure directories exist
 RECORDINGS_DIR.mkdir(exist_ok=True)
@@ -58,14 +101,65 @@ TRANSCRIPTS_DIR.mkdir(exist_ok=True)
 LOGS_DIR.mkdir(exist_ok=True)
 
 
+class _SpeechRetry(Retry):
+    """Retry for the Speech API: GETs/DELETEs on throttling and 5xx, but a POST
+    only on 429, since a 5xx may come after the job was already created"""
+    
+    def is_retry(self, method, status_code, has_retry_after=False):
+        if method == 'POST':
+            return status_code == 429 and bool(self.total)
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+def _stamp(iso):
+    """Convert a Graph ISO-8601 timestamp to the YYYYMMDD_HHMMSS filename key"""
+    if not iso:
+        return ''
+    try:
+        return datetime.fromisoformat(iso.replace('Z', '+00:00')).strftime('%Y%m%d_%H%M%S')
+    except ValueError:
+        # e.g. 7-digit fractional seconds; the leading fields are fixed-width
+        return f"{iso[:10].replace('-', '')}_{iso[11:19].replace(':', '')}"
+
+
 class OneDriveRecordingTranscriber:
     def __init__(self):
         self.credential = ClientSecretCredential(TENANT_ID, CLIENT_ID, CLIENT_SECRET)
         self.token = None
         self.token_expires_at = None
         self.headers = None
+        self.session = requests.Session()
+        # Retry throttled (429 + Retry-After) and transient failures, including
+        # the $batch POSTs, so parallel scans don't silently miss users
+        retry_strategy = Retry(
+            total=5,
+            backoff_factor=1.0,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=['GET', 'POST'],
+            respect_retry_after_header=True
+        )
+        adapter = HTTPAdapter(pool_connections=64, pool_maxsize=64, max_retries=retry_strategy)
+        self.session.mount('https://', adapter)
+        # Batch transcription jobs are billed per create, so they get their own
+        # session that never replays a create the service may have accepted
+        self.speech_session = requests.Session()
+        self.speech_session.mount('https://', HTTPAdapter(max_retries=_SpeechRetry(
+            total=5,
+            backoff_factor=1.0,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=['GET', 'DELETE'],
+            respect_retry_after_header=True
+        )))
         self.all_recordings = []
         self.recordings_to_transcribe = []
+        self._lock = threading.Lock()
+        self._ffmpeg_ok = shutil.which('ffmpeg') is not None
+        self._speechsdk = None
+        self._speech_config = None
+        self._db_lock = threading.Lock()
+        self._db = self._open_recordings_db()
+        # Users whose Recordings folder was listed completely this run
+        self._listed_users = set()
         self.stats = {
             'users_scanned': 0,
             'total_recordings': 0,
@@ -75,6 +169,103 @@ class OneDriveRecordingTranscriber:
             'errors': 0
         }
     
+    def _open_recordings_db(self):
+        """Open the SQLite store of seen recordings and their transcription state"""
+        conn = sqlite3.connect(str(RECORDINGS_DB), check_same_thread=False)
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS rec ('
+            'user_id TEXT, file_id TEXT, user_name TEXT, file_name TEXT, '
+            'created TEXT, size INT, transcribed INT DEFAULT 0, '
+            'PRIMARY KEY (user_id, file_id))'
+        )
+        # Per-user Recordings folder id and drive delta link for incremental scans
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS drive ('
+            'user_id TEXT PRIMARY KEY, folder_id TEXT, delta_link TEXT)'
+        )
+        conn.commit()
+        return conn
+    
+    def _drive_state(self):
+        """user_id -> (Recordings folder id, delta link) from earlier runs"""
+        with self._db_lock:
+            rows = self._db.execute('SELECT user_id, folder_id, delta_link FROM drive').fetchall()
+        return {user_id: (folder_id, delta_link) for user_id, folder_id, delta_link in rows}
+    
+    def _store_drive_state(self, user_id, folder_id, delta_link, file_ids):
+        """Save a user's delta link after a full listing, dropping recordings
+        that are no longer in the folder"""
+        with self._db_lock:
+            stored = {row[0] for row in self._db.execute(
+                'SELECT file_id FROM rec WHERE user_id = ?', (user_id,)
+            )}
+            self._db.executemany(
+                'DELETE FROM rec WHERE user_id = ? AND file_id = ?',
+                [(user_id, file_id) for file_id in stored - file_ids]
+            )
+            self._db.execute(
+                'INSERT OR REPLACE INTO drive (user_id, folder_id, delta_link) VALUES (?, ?, ?)',
+                (user_id, folder_id, delta_link)
+            )
+            self._db.commit()
+    
+    def _forget_drive_state(self, user_id):
+        """Drop an unusable delta link so the user is listed again"""
+        with self._db_lock:
+            self._db.execute('DELETE FROM drive WHERE user_id = ?', (user_id,))
+            self._db.commit()
+    
+    def _stored_recordings(self, users):
+        """Recording dicts for users from the database (no download URLs)"""
+        by_id = {user['id']: user for user in users}
+        with self._db_lock:
+            rows = self._db.execute(
+                'SELECT user_id, file_id, user_name, file_name, created, size FROM rec'
+            ).fetchall()
+        recordings = []
+        for user_id, file_id, user_name, file_name, created, size in rows:
+            user = by_id.get(user_id)
+            if user is None:
+                continue
+            recordings.append({
+                'user_id': user_id,
+                'user_name': user_name,
+                'user_email': user.get('mail', '') or user.get('userPrincipalName', ''),
+                'file_id': file_id,
+                'file_name': file_name,
+                'size': size,
+                'created': created,
+                'stamp': _stamp(created),
+                'download_url': ''
+            })
+        return recordings
+    
+    def _remember_recordings(self, recordings):
+        """Record newly seen recordings (existing rows keep their state)"""
+        with self._db_lock:
+            self._db.executemany(
+                'INSERT OR IGNORE INTO rec (user_id, file_id, user_name, file_name, created, size) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                [(r['user_id'], r['file_id'], r['user_name'], r['file_name'], r['created'], r['size'])
+                 for r in recordings]
+            )
+            self._db.commit()
+    
+    def _transcribed_keys(self):
+        """(user_id, file_id) pairs already transcribed in earlier runs"""
+        with self._db_lock:
+            rows = self._db.execute('SELECT user_id, file_id FROM rec WHERE transcribed = 1').fetchall()
+        return frozenset(rows)
+    
+    def _mark_transcribed(self, recording):
+        """Flag a recording as transcribed so later runs skip it"""
+        with self._db_lock:
+            self._db.execute(
+                'UPDATE rec SET transcribed = 1 WHERE user_id = ? AND file_id = ?',
+                (recording['user_id'], recording['file_id'])
+            )
+            self._db.commit()
+    
     def authenticate(self):
         """Authenticate with Microsoft Graph API"""
         logger.info("Authenticating with Microsoft Graph API...")
@@ -86,6 +277,7 @@ class OneDriveRecordingTranscriber:
             'Authorization': f'Bearer {self.token}',
             'Content-Type': 'application/json'
         }
+        self.session.headers.update(self.headers)
         logger.info("Authentication successful!")
     
     def refresh_token_if_needed(self):
@@ -97,11 +289,12 @@ class OneDriveRecordingTranscriber:
     def get_all_users(self):
         """Get all users in the organization"""
         logger.info("Fetching all users...")
-        url = 'https://graph.microsoft.com/v1.0/users?$top=100'
+        # Only the fields used downstream, at Graph's maximum page size for /users
+        url = 'https://graph.microsoft.com/v1.0/users?$top=999&$select=id,displayName,mail,userPrincipalName'
         users = []
         
         while url:
-            resp = requests.get(url, headers=self.headers, timeout=30)
+            resp = self.session.get(url, headers={'ConsistencyLevel': 'eventual'}, timeout=30)
             if resp.status_code == 200:
                 data = resp.json()
                 users.extend(data.get('value', []))
@@ -114,14 +307,39 @@ class OneDriveRecordingTranscriber:
         return users
     
     def get_existing_transcripts(self):
-        """Get list of existing transcript filenames"""
+        """Get the YYYYMMDD_HHMMSS stamps of existing transcripts"""
         existing = set()
-        for f in TRANSCRIPTS_DIR.glob('*.vtt'):
-            # Extract date pattern from filename
-            match = re.search(r'(\d{8}_\d{6})', f.name)
-            if match:
-                existing.add(match.group(1))
-        return existing
+        # scandir yields cached names/types, avoiding a Path object and stat per file
+        with os.scandir(TRANSCRIPTS_DIR) as it:
+            for entry in it:
+                name = entry.name
+                if name.endswith('.vtt') and entry.is_file():
+                    match = _DATE_RE.search(name)
+                    if match:
+                        existing.add(match.group(1))
+        return frozenset(existing)
+    
+    def _build_recordings(self, items, user_id, user_name, user_email):
+        """Turn a Recordings folder listing into recording dicts (MP4 only)"""
+        recordings = []
+        for item in items:
+            if not item.get('name', '').lower().endswith('.mp4'):
+                continue
+            recordings.append({
+                'user_id': user_id,
+                'user_name': user_name,
+                'user_email': user_email,
+                'file_id': item.get('id'),
+                'file_name': item.get('name'),
+                'size': item.get('size', 0),
+                'created': item.get('createdDateTime', ''),
+                'stamp': _stamp(item.get('createdDateTime', '')),
+                'download_url': item.get('@microsoft.graph.downloadUrl', '')
+            })
+        
+        if recordings:
+            logger.info(f"  {user_name}: {len(recordings)} recordings found")
+        return recordings
     
     def scan_user_recordings(self, user_id, user_name, user_email):
         """Scan a user's OneDrive for MP4 recordings"""
@@ -129,26 +347,13 @@ class OneDriveRecordingTranscriber:
         
         try:
             url = f'https://graph.microsoft.com/v1.0/users/{user_id}/drive/root:/Recordings:/children?$top=500'
-            resp = requests.get(url, headers=self.headers, timeout=30)
+            resp = self.session.get(url, timeout=30)
             
             if resp.status_code == 200:
-                items = resp.json().get('value', [])
-                mp4_files = [i for i in items if i.get('name', '').lower().endswith('.mp4')]
-                
-                for mp4 in mp4_files:
-                    recordings.append({
-                        'user_id': user_id,
-                        'user_name': user_name,
-                        'user_email': user_email,
-                        'file_id': mp4.get('id'),
-                        'file_name': mp4.get('name'),
-                        'size': mp4.get('size', 0),
-                        'created': mp4.get('createdDateTime', ''),
-                        'download_url': mp4.get('@microsoft.graph.downloadUrl', '')
-                    })
-                
-                if mp4_files:
-                    logger.info(f"  {user_name}: {len(mp4_files)} recordings found")
+                data = resp.json()
+                recordings = self._build_recordings(data.get('value', []), user_id, user_name, user_email)
+                if '@odata.nextLink' not in data:
+                    self._listed_users.add(user_id)
             elif resp.status_code == 404:
                 # No Recordings folder
                 pass
@@ -159,6 +364,215 @@ class OneDriveRecordingTranscriber:
         
         return recordings
     
+    def _build_batch(self, users):
+        """Build $batch sub-requests for users' Recordings folders, keyed by request id"""
+        by_id = {}
+        batch_requests = []
+        for i, user in enumerate(users):
+            by_id[str(i)] = (
+                user['id'],
+                user.get('displayName', 'Unknown'),
+                user.get('mail', '') or user.get('userPrincipalName', '')
+            )
+            batch_requests.append({
+                'id': str(i),
+                'method': 'GET',
+                'url': f"/users/{user['id']}/drive/root:/Recordings:/children?$top=500"
+            })
+        return by_id, batch_requests
+    
+    def _parse_batch(self, responses, by_id):
+        """Turn $batch sub-responses into recordings, retrying failed users singly"""
+        recordings = []
+        for sub in responses:
+            user_id, user_name, user_email = by_id[sub.get('id')]
+            status = sub.get('status')
+            if status == 200:
+                body = sub.get('body') or {}
+                recordings.extend(self._build_recordings(body.get('value', []), user_id, user_name, user_email))
+                if '@odata.nextLink' not in body:
+                    self._listed_users.add(user_id)
+            elif status == 404:
+                # No Recordings folder
+                pass
+            elif status in (429, 500, 502, 503, 504):
+                # Throttled or transient; the single-user path retries via the session
+                recordings.extend(self.scan_user_recordings(user_id, user_name, user_email))
+            else:
+                logger.warning(f"  {user_name}: Error {status}")
+        return recordings
+    
+    def _scan_individually(self, by_id, error):
+        """Fallback when a whole $batch call fails: one request per user"""
+        logger.warning(f"  Batch scan failed ({error}), scanning users individually")
+        recordings = []
+        for user_id, user_name, user_email in by_id.values():
+            recordings.extend(self.scan_user_recordings(user_id, user_name, user_email))
+        return recordings
+    
+    def scan_user_batch(self, users):
+        """Scan up to GRAPH_BATCH_SIZE users' Recordings folders with one $batch request"""
+        by_id, batch_requests = self._build_batch(users)
+        try:
+            resp = self.session.post(
+                'https://graph.microsoft.com/v1.0/$batch',
+                json={'requests': batch_requests},
+                timeout=60
+            )
+            if resp.status_code != 200:
+                raise RuntimeError(f"batch returned {resp.status_code}")
+            responses = resp.json().get('responses', [])
+        except Exception as e:
+            return self._scan_individually(by_id, e)
+        
+        return self._parse_batch(responses, by_id)
+    
+    async def _scan_user_batch_async(self, http, semaphore, users):
+        """aiohttp variant of scan_user_batch"""
+        by_id, batch_requests = self._build_batch(users)
+        async with semaphore:
+            try:
+                async with http.post(
+                    'https://graph.microsoft.com/v1.0/$batch',
+                    json={'requests': batch_requests}
+                ) as resp:
+                    if resp.status != 200:
+                        raise RuntimeError(f"batch returned {resp.status}")
+                    responses = (await resp.json()).get('responses', [])
+            except Exception as e:
+                return await asyncio.to_thread(self._scan_individually, by_id, e)
+        
+        # Any per-user retries use the blocking session, so keep them off the event loop
+        return await asyncio.to_thread(self._parse_batch, responses, by_id)
+    
+    async def scan_all_users_async(self, batches):
+        """Scan user batches on one event loop, SCAN_WORKERS requests in flight"""
+        semaphore = asyncio.Semaphore(SCAN_WORKERS)
+        connector = aiohttp.TCPConnector(limit=SCAN_WORKERS)
+        timeout = aiohttp.ClientTimeout(total=60)
+        async with aiohttp.ClientSession(headers=self.headers, connector=connector, timeout=timeout) as http:
+            results = await asyncio.gather(
+                *(self._scan_user_batch_async(http, semaphore, batch) for batch in batches)
+            )
+        return list(zip(batches, results))
+    
+    def _graph_batch(self, requests_list):
+        """POST GET sub-requests to $batch, GRAPH_BATCH_SIZE per call and calls in parallel.
+        
+        Yields (id, status, body) per sub-request; sub-requests of a failed
+        call come back with status None.
+        """
+        chunks = [requests_list[i:i + GRAPH_BATCH_SIZE] for i in range(0, len(requests_list), GRAPH_BATCH_SIZE)]
+        
+        def send(chunk):
+            try:
+                resp = self.session.post('https://graph.microsoft.com/v1.0/$batch', json={'requests': chunk}, timeout=60)
+                if resp.status_code == 200:
+                    return resp.json().get('responses', [])
+            except Exception as e:
+                logger.warning(f"  Batch request failed: {e}")
+            return [{'id': req['id'], 'status': None} for req in chunk]
+        
+        with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as executor:
+            for responses in executor.map(send, chunks):
+                for sub in responses:
+                    yield sub.get('id'), sub.get('status'), sub.get('body') or {}
+    
+    def _sync_user_delta(self, user, folder_id, delta_link):
+        """Apply drive changes since delta_link to the user's stored recordings.
+        
+        Delta responses omit parentReference.path, so items are matched to the
+        Recordings folder by parent id. Returns False if the link is no longer
+        usable (e.g. 410 Gone) and the user must be listed again.
+        """
+        changes = []
+        url = delta_link
+        while url:
+            try:
+                resp = self.session.get(url, timeout=30)
+            except Exception:
+                return False
+            if resp.status_code != 200:
+                return False
+            data = resp.json()
+            changes.extend(data.get('value', []))
+            url = data.get('@odata.nextLink')
+            delta_link = data.get('@odata.deltaLink', delta_link)
+        
+        user_id = user['id']
+        upserts = []
+        deletes = []
+        for item in changes:
+            parent_id = (item.get('parentReference') or {}).get('id')
+            if (item.get('deleted') or parent_id != folder_id
+                    or not item.get('name', '').lower().endswith('.mp4')):
+                deletes.append((user_id, item.get('id')))
+            else:
+                upserts.append((user_id, item.get('id'), user.get('displayName', 'Unknown'),
+                                item.get('name'), item.get('createdDateTime', ''), item.get('size', 0)))
+        with self._db_lock:
+            self._db.executemany('DELETE FROM rec WHERE user_id = ? AND file_id = ?', deletes)
+            self._db.executemany(
+                'INSERT INTO rec (user_id, file_id, user_name, file_name, created, size) '
+                'VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (user_id, file_id) DO UPDATE SET '
+                'file_name = excluded.file_name, created = excluded.created, size = excluded.size',
+                upserts
+            )
+            self._db.execute('UPDATE drive SET delta_link = ? WHERE user_id = ?', (delta_link, user_id))
+            self._db.commit()
+        return True
+    
+    def _fill_download_urls(self, recordings):
+        """Fetch pre-signed download URLs for recordings that lack one.
+        
+        Recordings served from the database have none, since the URLs expire
+        within the hour; only the ones about to be used are looked up.
+        """
+        missing = [r for r in recordings if not r.get('download_url')]
+        batch_requests = [
+            {'id': str(i), 'method': 'GET',
+             'url': f"/users/{r['user_id']}/drive/items/{r['file_id']}?$select=id,@microsoft.graph.downloadUrl"}
+            for i, r in enumerate(missing)
+        ]
+        for req_id, status, body in self._graph_batch(batch_requests):
+            if status == 200:
+                missing[int(req_id)]['download_url'] = body.get('@microsoft.graph.downloadUrl', '')
+    
+    def _seed_drive_state(self, users):
+        """Find each user's Recordings folder and take a delta token *before*
+        the folder is listed, so nothing created in between is missed.
+        
+        Returns (users with a Recordings folder or an unknown answer,
+        user_id -> (folder id, delta link) for the ones fully seeded).
+        """
+        probe_requests = [
+            {'id': str(i), 'method': 'GET', 'url': f"/users/{user['id']}/drive/root:/Recordings?$select=id"}
+            for i, user in enumerate(users)
+        ]
+        folder_ids = {}
+        list_users = []
+        for req_id, status, body in self._graph_batch(probe_requests):
+            user = users[int(req_id)]
+            if status == 200:
+                folder_ids[user['id']] = body.get('id')
+                list_users.append(user)
+            elif status != 404:
+                # Unknown: list anyway, without a delta link
+                list_users.append(user)
+        
+        seed_users = [user for user in list_users if user['id'] in folder_ids]
+        seed_requests = [
+            {'id': str(i), 'method': 'GET',
+             'url': f"/users/{user['id']}/drive/root/delta?token=latest&$select={DELTA_FIELDS}"}
+            for i, user in enumerate(seed_users)
+        ]
+        seeded = {}
+        for req_id, status, body in self._graph_batch(seed_requests):
+            user_id = seed_users[int(req_id)]['id']
+            if status == 200 and body.get('@odata.deltaLink'):
+                seeded[user_id] = (folder_ids[user_id], body['@odata.deltaLink'])
+        return list_users, seeded
+    
     def scan_all_users(self):
         """Scan all users for recordings"""
         logger.info("="*60)
@@ -168,160 +582,262 @@ class OneDriveRecordingTranscriber:
         users = self.get_all_users()
         existing_transcripts = self.get_existing_transcripts()
         
-        for user in users:
-            user_id = user['id']
-            user_name = user.get('displayName', 'Unknown')
-            user_email = user.get('mail', '') or user.get('userPrincipalName', '')
-            
-            recordings = self.scan_user_recordings(user_id, user_name, user_email)
-            self.all_recordings.extend(recordings)
-            self.stats['users_scanned'] += 1
+        # Refresh once up front; workers only read self.headers during the fan-out
+        self.refresh_token_if_needed()
+        
+        # Users seen on an earlier run: apply only what changed in their drive
+        drive_state = self._drive_state()
+        synced_users = [user for user in users if drive_state.get(user['id'], (None, None))[1]]
+        list_users = [user for user in users if not drive_state.get(user['id'], (None, None))[1]]
+        with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as executor:
+            synced = list(executor.map(
+                lambda u: self._sync_user_delta(u, *drive_state[u['id']]), synced_users
+            ))
+        stale = [user for user, ok in zip(synced_users, synced) if not ok]
+        for user in stale:
+            # Delta link expired (410) or failed: start over from a listing
+            self._forget_drive_state(user['id'])
+        synced_users = [user for user, ok in zip(synced_users, synced) if ok]
+        list_users.extend(stale)
+        if synced_users:
+            recordings = self._stored_recordings(synced_users)
+            with self._lock:
+                self.all_recordings.extend(recordings)
+                self.stats['users_scanned'] += len(synced_users)
+            logger.info(f"  {len(synced_users)} users synced from delta links, {len(list_users)} to list")
+        
+        # Everyone else: skip users without a Recordings folder, seed a delta
+        # link for the rest and list their folders
+        probed = len(list_users)
+        list_users, seeded = self._seed_drive_state(list_users)
+        with self._lock:
+            self.stats['users_scanned'] += probed - len(list_users)
+        
+        # Each worker sends one $batch request covering GRAPH_BATCH_SIZE users
+        batches = [list_users[i:i + GRAPH_BATCH_SIZE] for i in range(0, len(list_users), GRAPH_BATCH_SIZE)]
+        if AIOHTTP_AVAILABLE:
+            scanned = asyncio.run(self.scan_all_users_async(batches))
+        else:
+            with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as executor:
+                futures = {executor.submit(self.scan_user_batch, batch): batch for batch in batches}
+                scanned = [(futures[f], f.result()) for f in as_completed(futures)]
+        
+        for batch, recordings in scanned:
+            with self._lock:
+                self.all_recordings.extend(recordings)
+                self.stats['users_scanned'] += len(batch)
+            self._remember_recordings(recordings)
+        
+        # Fully listed users start syncing from their delta link next run
+        listed_ids = {}
+        for recording in self.all_recordings:
+            listed_ids.setdefault(recording['user_id'], set()).add(recording['file_id'])
+        for user_id, (folder_id, delta_link) in seeded.items():
+            if user_id in self._listed_users:
+                self._store_drive_state(user_id, folder_id, delta_link, listed_ids.get(user_id, set()))
         
-        self.stats['total_recordings'] = len(self.all_recordings)
+        with self._lock:
+            self.stats['total_recordings'] = len(self.all_recordings)
         logger.info(f"\nTotal recordings found: {self.stats['total_recordings']}")
         
-        # Check which recordings don't have transcripts
-        for rec in self.all_recordings:
-            created = rec.get('created', '')
-            if created:
-                # Create date pattern to match against existing transcripts
-                date_str = created[:10].replace('-', '')
-                time_str = created[11:19].replace(':', '') if len(created) > 11 else ''
-                pattern = f"{date_str}_{time_str}"
-                
-                if pattern not in existing_transcripts:
-                    self.recordings_to_transcribe.append(rec)
+        # Check which recordings don't have transcripts (stamps precomputed on both sides)
+        transcribed = self._transcribed_keys()
+        self.recordings_to_transcribe = [
+            r for r in self.all_recordings
+            if r.get('stamp') and r['stamp'] not in existing_transcripts
+            and (r['user_id'], r['file_id']) not in transcribed
+        ]
         
         self.stats['recordings_without_transcript'] = len(self.recordings_to_transcribe)
         logger.info(f"Recordings WITHOUT transcripts: {self.stats['recordings_without_transcript']}")
         
         return self.recordings_to_transcribe
     
+    def _open_download(self, recording):
+        """Open a streaming response for a recording, preferring its pre-signed URL"""
+        user_id = recording['user_id']
+        file_id = recording['file_id']
+        item_url = f'https://graph.microsoft.com/v1.0/users/{user_id}/drive/items/{file_id}'
+        
+        download_url = recording.get('download_url')
+        if download_url:
+            # Pre-signed URLs go straight to storage and must not carry the bearer token
+            resp = self.session.get(download_url, headers={'Authorization': None}, timeout=120, stream=True)
+            if resp.status_code not in (401, 403):
+                return resp
+            resp.close()
+            
+            # URL expired (they last ~1 hour); fetch a fresh one from the item metadata
+            meta = self.session.get(item_url, timeout=30)
+            if meta.status_code == 200:
+                fresh_url = meta.json().get('@microsoft.graph.downloadUrl')
+                if fresh_url:
+                    recording['download_url'] = fresh_url
+                    return self.session.get(fresh_url, headers={'Authorization': None}, timeout=120, stream=True)
+        
+        return self.session.get(f'{item_url}/content', timeout=120, stream=True, allow_redirects=True)
+    
     def download_recording(self, recording):
         """Download a recording from OneDrive"""
         # Refresh token if needed before each download
         self.refresh_token_if_needed()
         
-        user_id = recording['user_id']
-        file_id = recording['file_id']
         file_name = recording['file_name']
-        created = recording['created']
-        
-        # Get download URL
-        url = f'https://graph.microsoft.com/v1.0/users/{user_id}/drive/items/{file_id}/content'
+        stamp = recording.get('stamp') or 'unknown_'
         
         try:
-            resp = requests.get(url, headers=self.headers, timeout=120, stream=True, allow_redirects=True)
-            
-            if resp.status_code == 200:
-                # Create safe filename
-                date_str = created[:10].replace('-', '') if created else 'unknown'
-                time_str = created[11:19].replace(':', '') if created and len(created) > 11 else ''
-                safe_name = re.sub(r'[<>:"/\\|?*]', '', file_name)[:50]
-                filename = f"{date_str}_{time_str}_{safe_name}"
-                if not filename.lower().endswith('.mp4'):
-                    filename += '.mp4'
-                
-                filepath = RECORDINGS_DIR / filename
-                
-                # Download file
-                total_size = int(resp.headers.get('content-length', 0))
-                with open(filepath, 'wb') as f:
-                    downloaded = 0
-                    for chunk in resp.iter_content(chunk_size=8192):
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                
-                size_mb = filepath.stat().st_size / 1024 / 1024
-                logger.info(f"    Downloaded: {filename} ({size_mb:.1f} MB)")
-                return filepath
-            else:
-                logger.error(f"    Failed to download: {resp.status_code}")
-                return None
+            with self._open_download(recording) as resp:
+                if resp.status_code == 200:
+                    # Create safe filename
+                    safe_name = _UNSAFE_FN_RE.sub('', file_name)[:50]
+                    filename = f"{stamp}_{safe_name}"
+                    if not filename.lower().endswith('.mp4'):
+                        filename += '.mp4'
+                    
+                    filepath = RECORDINGS_DIR / filename
+                    
+                    # Download file in 1 MiB chunks
+                    resp.raw.decode_content = True
+                    total_size = int(resp.headers.get('content-length', 0))
+                    # content-length counts encoded bytes; only comparable when unencoded
+                    expected = total_size if not resp.headers.get('content-encoding') else 0
+                    try:
+                        with open(filepath, 'wb') as f:
+                            # Reserve the full extent up front to avoid fragmentation (POSIX only)
+                            if total_size > 0 and hasattr(os, 'posix_fallocate'):
+                                try:
+                                    os.posix_fallocate(f.fileno(), 0, total_size)
+                                except OSError:
+                                    pass
+                            shutil.copyfileobj(resp.raw, f, length=DOWNLOAD_CHUNK_SIZE)
+                            # Drop any preallocated tail the body didn't fill
+                            written = f.tell()
+                            f.truncate(written)
+                        if expected and written != expected:
+                            raise OSError(f"incomplete download: got {written} of {expected} bytes")
+                    except BaseException:
+                        filepath.unlink(missing_ok=True)
+                        raise
+                    
+                    size_mb = filepath.stat().st_size / 1024 / 1024
+                    logger.info(f"    Downloaded: {filename} ({size_mb:.1f} MB)")
+                    return filepath
+                else:
+                    logger.error(f"    Failed to download: {resp.status_code}")
+                    return None
         except Exception as e:
             logger.error(f"    Error downloading: {e}")
             return None
     
-    def extract_audio(self, video_path):
-        """Extract audio from MP4 using ffmpeg"""
-        audio_path = video_path.with_suffix('.wav')
-        
-        try:
-            # Check if ffmpeg is available
-            result = subprocess.run(['ffmpeg', '-version'], capture_output=True)
-            if result.returncode != 0:
-                logger.error("    FFmpeg not found!")
-                return None
-            
-            # Extract audio (16kHz mono WAV for best speech recognition)
-            cmd = [
-                'ffmpeg', '-i', str(video_path),
-                '-ar', '16000',  # 16kHz sample rate
-                '-ac', '1',      # Mono
-                '-y',            # Overwrite
-                str(audio_path)
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode == 0:
-                logger.info(f"    Extracted audio: {audio_path.name}")
-                return audio_path
-            else:
-                logger.error(f"    FFmpeg error: {result.stderr[:100]}")
-                return None
-        except FileNotFoundError:
-            logger.error("    FFmpeg not installed! Run: choco install ffmpeg")
-            return None
-        except Exception as e:
-            logger.error(f"    Error extracting audio: {e}")
-            return None
+    def start_audio_stream(self, video_path):
+        """Start ffmpeg decoding the MP4 to raw 16kHz mono PCM on stdout"""
+        # One thread per ffmpeg so several decodes can run side by side
+        cmd = [
+            'ffmpeg', '-nostdin', '-loglevel', 'error',
+            '-threads', '1',
+            '-i', str(video_path),
+            '-vn',                   # Drop video
+            '-ac', '1',              # Mono
+            '-ar', '16000',          # 16kHz sample rate
+            '-f', 's16le',           # Raw 16-bit PCM
+            'pipe:1'
+        ]
+        return subprocess.Popen(
+            cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=1 << 20
+        )
     
-    def transcribe_audio(self, audio_path):
-        """Transcribe audio using Azure Speech-to-Text"""
+    def _get_speech_config(self):
+        """Import the Speech SDK and build the shared SpeechConfig on first use"""
+        with self._lock:
+            if self._speech_config is None:
+                import azure.cognitiveservices.speech as speechsdk
+                speech_config = speechsdk.SpeechConfig(subscription=SPEECH_KEY, region=SPEECH_REGION)
+                speech_config.speech_recognition_language = "en-US"
+                self._speechsdk = speechsdk
+                self._speech_config = speech_config
+        return self._speechsdk, self._speech_config
+    
+    def transcribe_audio(self, video_path):
+        """Transcribe a recording using Azure Speech-to-Text.
+        
+        Audio is decoded by ffmpeg and pushed straight into the recognizer,
+        so no intermediate WAV file is written.
+        """
         if not SPEECH_KEY:
             logger.error("    Azure Speech API key not configured!")
             logger.error("    Add AZURE_SPEECH_KEY to your .env file")
             return None
         
+        if not self._ffmpeg_ok:
+            logger.error("    FFmpeg not installed! Run: choco install ffmpeg")
+            return None
+        
         try:
-            import azure.cognitiveservices.speech as speechsdk
+            speechsdk, speech_config = self._get_speech_config()
             
-            speech_config = speechsdk.SpeechConfig(subscription=SPEECH_KEY, region=SPEECH_REGION)
-            speech_config.speech_recognition_language = "en-US"
-            
-            audio_config = speechsdk.audio.AudioConfig(filename=str(audio_path))
+            stream_format = speechsdk.audio.AudioStreamFormat(samples_per_second=16000, bits_per_sample=16, channels=1)
+            push_stream = speechsdk.audio.PushAudioInputStream(stream_format)
+            audio_config = speechsdk.audio.AudioConfig(stream=push_stream)
             speech_recognizer = speechsdk.SpeechRecognizer(speech_config=speech_config, audio_config=audio_config)
             
-            logger.info(f"    Transcribing... (this may take several minutes)")
-            
-            done = False
-            transcript_parts = []
-            
-            def stop_cb(evt):
-                nonlocal done
-                done = True
-            
-            def recognized_cb(evt):
-                if evt.result.reason == speechsdk.ResultReason.RecognizedSpeech:
-                    transcript_parts.append(evt.result.text)
-            
-            speech_recognizer.recognized.connect(recognized_cb)
-            speech_recognizer.session_stopped.connect(stop_cb)
-            speech_recognizer.canceled.connect(stop_cb)
-            
-            speech_recognizer.start_continuous_recognition()
-            
-            # Wait for transcription (max 20 minutes)
-            timeout = 1200
-            start_time = time.time()
-            while not done and (time.time() - start_time) < timeout:
-                time.sleep(1)
-            
-            speech_recognizer.stop_continuous_recognition()
-            
-            full_transcript = ' '.join(transcript_parts)
-            logger.info(f"    Transcription complete! ({len(full_transcript)} characters)")
-            return full_transcript
+            ffmpeg = self.start_audio_stream(video_path)
+            try:
+                def feed_audio():
+                    try:
+                        while True:
+                            chunk = ffmpeg.stdout.read(65536)
+                            if not chunk:
+                                break
+                            push_stream.write(chunk)
+                    finally:
+                        push_stream.close()
+                
+                feeder = threading.Thread(target=feed_audio, daemon=True)
+                
+                logger.info(f"    Transcribing... (this may take several minutes)")
+                
+                done_evt = threading.Event()
+                transcript_parts = []
+                
+                def stop_cb(evt):
+                    done_evt.set()
+                
+                def recognized_cb(evt):
+                    if evt.result.reason == speechsdk.ResultReason.RecognizedSpeech:
+                        transcript_parts.append(evt.result.text)
+                
+                speech_recognizer.recognized.connect(recognized_cb)
+                speech_recognizer.session_stopped.connect(stop_cb)
+                speech_recognizer.canceled.connect(stop_cb)
+                
+                speech_recognizer.start_continuous_recognition()
+                feeder.start()
+                
+                # Wait for transcription (max 20 minutes)
+                finished = done_evt.wait(timeout=1200)
+                
+                speech_recognizer.stop_continuous_recognition()
+                if not finished:
+                    logger.warning("    Transcription timed out after 20 minutes, keeping partial result")
+                    ffmpeg.kill()
+                feeder.join(timeout=10)
+                ffmpeg.wait()
+                if ffmpeg.returncode not in (0, None) and finished:
+                    stderr = ffmpeg.stderr.read().decode('utf-8', errors='replace')
+                    logger.error(f"    FFmpeg error: {stderr[:100]}")
+                
+                char_count = sum(len(part) for part in transcript_parts)
+                logger.info(f"    Transcription complete! ({char_count} characters)")
+                return transcript_parts
+            finally:
+                # Don't leave ffmpeg (and its pipes) behind when anything above fails
+                if ffmpeg.poll() is None:
+                    ffmpeg.kill()
+                ffmpeg.wait()
         
         except ImportError:
             logger.error("    Azure Speech SDK not installed!")
@@ -331,38 +847,45 @@ class OneDriveRecordingTranscriber:
             logger.error(f"    Transcription error: {e}")
             return None
     
-    def save_transcript(self, transcript_text, recording, audio_path):
-        """Save transcript as VTT file"""
+    def save_transcript(self, transcript_parts, recording, video_path):
+        """Save transcript as VTT file.
+        
+        transcript_parts is the list of recognized phrases; they are written
+        one by one so the full text is never joined in memory.
+        """
         created = recording.get('created', '')
         user_name = recording.get('user_name', 'Unknown')
         file_name = recording.get('file_name', 'recording')
         
         # Create filename
-        date_str = created[:10].replace('-', '') if created else 'unknown'
-        time_str = created[11:19].replace(':', '') if created and len(created) > 11 else ''
-        safe_name = re.sub(r'[<>:"/\\|?*]', '', file_name.replace('.mp4', ''))[:40]
-        vtt_filename = f"{date_str}_{time_str}_{safe_name}.vtt"
+        stamp = recording.get('stamp') or 'unknown_'
+        safe_name = _UNSAFE_FN_RE.sub('', file_name.replace('.mp4', ''))[:40]
+        vtt_filename = f"{stamp}_{safe_name}.vtt"
         vtt_path = TRANSCRIPTS_DIR / vtt_filename
         
-        # Create VTT content
-        vtt_content = f"""WEBVTT
+        # VTT header
+        header = f"""WEBVTT
 
 NOTE Transcribed from OneDrive recording using Azure Speech-to-Text
 NOTE Source: {user_name} - {file_name}
 NOTE Date: {created}
 
 00:00:00.000 --> 99:59:59.999
-{transcript_text}
 """
         
-        with open(vtt_path, 'w', encoding='utf-8') as f:
-            f.write(vtt_content)
+        with open(vtt_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            f.write(header)
+            for i, part in enumerate(transcript_parts):
+                if i:
+                    f.write(' ')
+                f.write(part)
+            f.write('\n')
         
         logger.info(f"    Saved: {vtt_filename}")
         return vtt_path
     
     def process_recordings(self, max_recordings=5):
-        """Process recordings - download, extract audio, transcribe"""
+        """Process recordings - download, then stream audio into transcription"""
         logger.info("="*60)
         logger.info(f"PROCESSING RECORDINGS (max: {max_recordings})")
         logger.info("="*60)
@@ -380,43 +903,168 @@ NOTE Date: {created}
         
         # Process limited number
         to_process = sorted_recordings[:max_recordings]
+        total = len(to_process)
         
-        for i, rec in enumerate(to_process, 1):
-            logger.info(f"\n[{i}/{len(to_process)}] {rec['user_name']} - {rec['file_name']}")
-            logger.info(f"    Date: {rec['created']}")
-            logger.info(f"    Size: {rec['size'] / 1024 / 1024:.1f} MB")
-            
-            # Step 1: Download recording
-            video_path = self.download_recording(rec)
-            if not video_path:
-                self.stats['errors'] += 1
-                continue
-            self.stats['downloaded'] += 1
-            
-            # Step 2: Extract audio
-            audio_path = self.extract_audio(video_path)
-            if not audio_path:
-                self.stats['errors'] += 1
-                continue
-            
-            # Step 3: Transcribe
-            transcript = self.transcribe_audio(audio_path)
-            if not transcript:
-                self.stats['errors'] += 1
-                # Cleanup
-                if audio_path.exists():
-                    audio_path.unlink()
-                continue
-            
-            # Step 4: Save transcript
-            vtt_path = self.save_transcript(transcript, rec, audio_path)
-            self.stats['transcribed'] += 1
-            
-            # Cleanup audio file (keep video for reference)
-            if audio_path.exists():
-                audio_path.unlink()
-            
-            time.sleep(2)  # Rate limiting
+        # Stages overlap: recording N+1 downloads while N is being transcribed.
+        # The bounded queue caps how many downloaded videos wait on disk.
+        download_q = queue.Queue()
+        transcribe_q = queue.Queue(maxsize=2)
+        
+        for item in enumerate(to_process, 1):
+            download_q.put(item)
+        
+        def download_worker():
+            while True:
+                try:
+                    i, rec = download_q.get_nowait()
+                except queue.Empty:
+                    return
+                logger.info(f"\n[{i}/{total}] {rec['user_name']} - {rec['file_name']}")
+                logger.info(f"    Date: {rec['created']}")
+                logger.info(f"    Size: {rec['size'] / 1024 / 1024:.1f} MB")
+                
+                # Step 1: Download recording
+                try:
+                    video_path = self.download_recording(rec)
+                except Exception as e:
+                    logger.error(f"    Error downloading: {e}")
+                    video_path = None
+                if not video_path:
+                    self._increment_stat('errors')
+                    continue
+                self._increment_stat('downloaded')
+                transcribe_q.put((video_path, rec))
+        
+        def transcribe_worker():
+            while True:
+                item = transcribe_q.get()
+                if item is None:
+                    return
+                video_path, rec = item
+                
+                # A failure is counted against this recording only; the worker
+                # must keep draining the queue or downloads block on put()
+                try:
+                    # Step 2: Decode audio and transcribe (streamed, no WAV on disk)
+                    transcript = self.transcribe_audio(video_path)
+                    if transcript:
+                        # Step 3: Save transcript
+                        self.save_transcript(transcript, rec, video_path)
+                        self._mark_transcribed(rec)
+                        self._increment_stat('transcribed')
+                    else:
+                        self._increment_stat('errors')
+                except Exception as e:
+                    logger.error(f"    Error processing {rec.get('file_name', 'recording')}: {e}")
+                    self._increment_stat('errors')
+        
+        def start(target, count):
+            threads = [threading.Thread(target=target, daemon=True) for _ in range(count)]
+            for t in threads:
+                t.start()
+            return threads
+        
+        download_threads = start(download_worker, DOWNLOAD_WORKERS)
+        transcribe_threads = start(transcribe_worker, TRANSCRIBE_WORKERS)
+        
+        # Shut stages down in order, one sentinel per downstream worker
+        for t in download_threads:
+            t.join()
+        for _ in transcribe_threads:
+            transcribe_q.put(None)
+        for t in transcribe_threads:
+            t.join()
+    
+    def process_recordings_batch(self, max_recordings=5):
+        """Transcribe recordings server-side with the Azure Batch Transcription API.
+        
+        Azure fetches each recording directly from its pre-signed OneDrive URL,
+        so nothing is downloaded or decoded locally.
+        """
+        logger.info("="*60)
+        logger.info(f"BATCH TRANSCRIPTION (max: {max_recordings})")
+        logger.info("="*60)
+        
+        if not SPEECH_KEY:
+            logger.error("Azure Speech API key not configured!")
+            return
+        
+        to_process = sorted(
+            self.recordings_to_transcribe,
+            key=lambda x: x.get('created', ''),
+            reverse=True
+        )[:max_recordings]
+        self._fill_download_urls(to_process)
+        to_process = [r for r in to_process if r.get('download_url')]
+        if not to_process:
+            logger.info("No recordings to process!")
+            return
+        
+        speech_headers = {'Ocp-Apim-Subscription-Key': SPEECH_KEY, 'Authorization': None}
+        base_url = f'https://{SPEECH_REGION}.api.cognitive.microsoft.com/speechtotext/v3.2'
+        
+        resp = self.speech_session.post(
+            f'{base_url}/transcriptions',
+            headers=speech_headers,
+            json={
+                'contentUrls': [r['download_url'] for r in to_process],
+                'locale': 'en-US',
+                'displayName': f'OneDrive recordings {datetime.now():%Y%m%d_%H%M%S}',
+                'properties': {'wordLevelTimestampsEnabled': True}
+            },
+            timeout=60
+        )
+        if resp.status_code not in (200, 201):
+            logger.error(f"Failed to create batch transcription: {resp.status_code} - {resp.text[:200]}")
+            self._increment_stat('errors', len(to_process))
+            return
+        job_url = resp.json()['self']
+        logger.info(f"Submitted {len(to_process)} recordings: {job_url}")
+        
+        # Poll until Azure finishes the whole job
+        deadline = time.time() + BATCH_TIMEOUT_SECONDS
+        status = None
+        while time.time() < deadline:
+            status = self.speech_session.get(job_url, headers=speech_headers, timeout=30).json().get('status')
+            if status in ('Succeeded', 'Failed'):
+                break
+            time.sleep(BATCH_POLL_SECONDS)
+        
+        if status != 'Succeeded':
+            logger.error(f"Batch transcription ended with status: {status}")
+            self._increment_stat('errors', len(to_process))
+            return
+        
+        files_url = f'{job_url}/files'
+        done = set()
+        while files_url:
+            files = self.speech_session.get(files_url, headers=speech_headers, timeout=30).json()
+            for f in files.get('values', []):
+                match = _BATCH_RESULT_RE.search(f.get('name', ''))
+                if f.get('kind') != 'Transcription' or not match:
+                    continue
+                index = int(match.group(1))
+                if index >= len(to_process):
+                    continue
+                rec = to_process[index]
+                result = self.speech_session.get(f['links']['contentUrl'], headers={'Authorization': None}, timeout=60).json()
+                phrases = result.get('combinedRecognizedPhrases') or [{}]
+                transcript = phrases[0].get('display', '')
+                if transcript:
+                    self.save_transcript([transcript], rec, None)
+                    self._mark_transcribed(rec)
+                    self._increment_stat('transcribed')
+                    done.add(index)
+            files_url = files.get('@nextLink')
+        
+        self._increment_stat('errors', len(to_process) - len(done))
+        # Clean up the job on the Speech resource
+        self.speech_session.delete(job_url, headers=speech_headers, timeout=30)
+    
+    def _increment_stat(self, key, amount=1):
+        """Thread-safe increment of a stats counter"""
+        with self._lock:
+            self.stats[key] += amount
     
     def generate_report(self):
         """Generate summary report"""
@@ -424,35 +1072,32 @@ NOTE Date: {created}
         logger.info("TRANSCRIPTION SUMMARY")
         logger.info("="*60)
         
-        # Group recordings by user
-        by_user = {}
-        for rec in self.all_recordings:
-            user = rec['user_name']
-            if user not in by_user:
-                by_user[user] = {'total': 0, 'without_transcript': 0}
-            by_user[user]['total'] += 1
+        # Snapshot shared state so workers cannot mutate it mid-report
+        with self._lock:
+            all_recordings = list(self.all_recordings)
+            stats = dict(self.stats)
         
-        for rec in self.recordings_to_transcribe:
-            user = rec['user_name']
-            if user in by_user:
-                by_user[user]['without_transcript'] += 1
+        # Count recordings by user (users with only pending recordings are kept too)
+        total = Counter(r['user_name'] for r in all_recordings)
+        pending = Counter(r['user_name'] for r in self.recordings_to_transcribe)
+        total.update({user: 0 for user in pending if user not in total})
         
         logger.info("\nRecordings by User:")
-        for user, counts in sorted(by_user.items(), key=lambda x: x[1]['total'], reverse=True):
-            logger.info(f"  {user}: {counts['total']} total, {counts['without_transcript']} without transcript")
+        for user, count in total.most_common():
+            logger.info(f"  {user}: {count} total, {pending.get(user, 0)} without transcript")
         
         logger.info(f"""
 Summary:
 --------
-Users Scanned:              {self.stats['users_scanned']}
-Total Recordings:           {self.stats['total_recordings']}
-Without Transcript:         {self.stats['recordings_without_transcript']}
-Downloaded:                 {self.stats['downloaded']}
-Successfully Transcribed:   {self.stats['transcribed']}
-Errors:                     {self.stats['errors']}
+Users Scanned:              {stats['users_scanned']}
+Total Recordings:           {stats['total_recordings']}
+Without Transcript:         {stats['recordings_without_transcript']}
+Downloaded:                 {stats['downloaded']}
+Successfully Transcribed:   {stats['transcribed']}
+Errors:                     {stats['errors']}
 """)
     
-    def run(self, max_recordings=5):
+    def run(self, max_recordings=5, batch=False):
         """Run the full process"""
         start_time = datetime.now()
         logger.info(f"Starting OneDrive recording transcription - {start_time}")
@@ -465,7 +1110,10 @@ Errors:                     {self.stats['errors']}
             self.scan_all_users()
             
             # Step 3: Process recordings
-            self.process_recordings(max_recordings=max_recordings)
+            if batch:
+                self.process_recordings_batch(max_recordings=max_recordings)
+            else:
+                self.process_recordings(max_recordings=max_recordings)
             
             # Step 4: Generate report
             self.generate_report()
@@ -486,6 +1134,7 @@ def main():
     parser = argparse.ArgumentParser(description='Transcribe OneDrive recordings without transcripts')
     parser.add_argument('--max', type=int, default=5, help='Maximum recordings to process (default: 5)')
     parser.add_argument('--scan-only', action='store_true', help='Only scan, do not transcribe')
+    parser.add_argument('--batch', action='store_true', help='Use Azure Batch Transcription (no local download)')
     args = parser.parse_args()
     
     transcriber = OneDriveRecordingTranscriber()
@@ -495,7 +1144,7 @@ def main():
         transcriber.scan_all_users()
         transcriber.generate_report()
     else:
-        transcriber.run(max_recordings=args.max)
+        transcriber.run(max_recordings=args.max, batch=args.batch)
 
 
 if __name__ == '__main__':
@@ -11,13 +11,39 @@ Search everywhere for hr@our-assistants.com check-in meetings since November 1,
 
 import os
 import sys
+import asyncio
 import json
 import requests
 import re
-from datetime import datetime
+import time
+from requests.adapters import HTTPAdapter
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
 from azure.identity import ClientSecretCredential
 from dotenv import load_dotenv
+from phase_output import PhaseOutput
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+try:
+    import httpx
+    import h2  # noqa: F401  (httpx needs it for http2=True)
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
 
 load_dotenv()
 
@@ -35,6 +61,133 @@ TRANSCRIPTS_DIR = Path('transcripts')
 
 START_DATE = '2025-11-01'
 
+# Concurrent transcript lookups against Graph online meetings
+PROBE_WORKERS = 16
+
+# Run the slow whole-drive search only if the Recordings folder held fewer check-ins
+ONEDRIVE_SEARCH_THRESHOLD = 5
+
+# Only the drive item fields the OneDrive search reads
+DRIVE_ITEM_FIELDS = 'id,name,webUrl,size,folder'
+
+# Graph JSON batching accepts at most 20 sub-requests per $batch call
+GRAPH_BATCH_SIZE = 20
+
+# Subject/filename matching, compiled once for the scan loops
+CHECKIN_TOKENS = ('check-in', 'checkin')
+MEDIA_EXTENSIONS = ('.mp4', '.m4a', '.webm')
+_DATE_RE = re.compile(r'(\d{4})(\d{2})(\d{2})')
+_DROP_DIGITS = str.maketrans('', '', '0123456789')
+_HR_PERSON_RES = [
+    re.compile(r'Check-in\s+(\w+)\s+x\s+\w+', re.IGNORECASE),  # "Check-in Louise x Irvy"
+    re.compile(r'Check-in\s+(\w+)\s+x', re.IGNORECASE),         # "Check-in Shey xAnn"
+]
+_VA_NAME_RES = [
+    re.compile(r'x\s+([A-Za-z]+(?:\s+[A-Za-z]+)?)', re.IGNORECASE),  # "x Irvy" or "x Jon Jevi"
+]
+
+
+@dataclass(slots=True)
+class CalendarMeeting:
+    """Check-in event from HR's calendar"""
+    subject: str
+    date: str
+    time: str
+    event_id: str
+    is_online: bool
+    join_url: str
+    attendees: list
+    source: str
+
+
+@dataclass(slots=True)
+class DriveRecording:
+    """Check-in recording (file or folder) in HR's OneDrive"""
+    name: str
+    date: str
+    item_id: str
+    web_url: str
+    size: int
+    is_folder: bool
+    source: str
+
+
+@dataclass(slots=True)
+class LocalRecording:
+    """Check-in recording under RECORDINGS_DIR"""
+    name: str
+    path: str
+    stem: str
+    date: str
+    size_mb: float
+    source: str
+
+
+@dataclass(slots=True)
+class LocalTranscript:
+    """Check-in transcript under TRANSCRIPTS_DIR"""
+    name: str
+    path: str
+    date: str
+    source: str
+
+
+@dataclass(slots=True)
+class GraphMeeting:
+    """Check-in online meeting found through Graph"""
+    subject: str
+    meeting_id: str
+    date: str
+    has_transcript: bool
+    source: str
+
+
+def parse_json(resp):
+    """Decode a Graph response body, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(resp.content)
+    return resp.json()
+
+
+def retry_after_seconds(value, default):
+    """Seconds to wait for a Retry-After value (delay-seconds or HTTP-date), else default"""
+    if value is None:
+        return default
+    try:
+        return max(float(value), 0)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return max((parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds(), 0)
+    except (TypeError, ValueError):
+        return default
+
+
+def dump_json_bytes(data):
+    """Serialize results to indented UTF-8 JSON bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def parse_name_date(name):
+    """Return 'YYYY-MM-DD' from the first 8-digit run in a file/folder name, else ''"""
+    # Names with fewer than 8 digits can't match; skip the regex for them
+    if len(name) - len(name.translate(_DROP_DIGITS)) < 8:
+        return ''
+    date_match = _DATE_RE.search(name)
+    return f"{date_match.group(1)}-{date_match.group(2)}-{date_match.group(3)}" if date_match else ''
+
+
+def _walk_files(root):
+    """Yield DirEntry objects for every file under root without following symlinks"""
+    with os.scandir(root) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _walk_files(entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                yield entry
+
 
 class HRCheckInFinder:
     def __init__(self):
@@ -43,6 +196,21 @@ class HRCheckInFinder:
         self.headers = None
         self.checkin_meetings = []
         
+        # One pooled session so paged Graph calls reuse keep-alive connections
+        if HTTPX_AVAILABLE:
+            # Same get/post/headers surface as requests, but the paged GETs and
+            # threaded $batch POSTs are multiplexed over HTTP/2 with
+            # HPACK-compressed headers
+            self.session = httpx.Client(
+                http2=True,
+                timeout=30.0,
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=32)
+            )
+        else:
+            self.session = requests.Session()
+            self.session.mount('https://', HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=0))
+        
     def authenticate(self):
         print("Authenticating with Microsoft Graph API...")
         self.token = self.credential.get_token('https://graph.microsoft.com/.default').token
@@ -50,12 +218,27 @@ class HRCheckInFinder:
             'Authorization': f'Bearer {self.token}',
             'Content-Type': 'application/json'
         }
+        self.session.headers.update({
+            'Authorization': f'Bearer {self.token}',
+            'Accept': 'application/json'
+        })
         print("✅ Authenticated\n")
     
+    def _get_with_retry(self, url, params=None, max_retries=5, **kwargs):
+        """GET that waits out 429/503 throttling (Retry-After, else exponential backoff)"""
+        for attempt in range(max_retries):
+            resp = self.session.get(url, params=params, **kwargs)
+            if resp.status_code not in (429, 503):
+                return resp
+            delay = retry_after_seconds(resp.headers.get('Retry-After'), 2 ** attempt)
+            print(f"    Throttled ({resp.status_code}), retrying in {delay:.0f}s...")
+            time.sleep(delay)
+        return self.session.get(url, params=params, **kwargs)
+    
     def is_checkin_meeting(self, subject):
         """Check if meeting subject indicates a check-in"""
         subject_lower = subject.lower()
-        return 'check-in' in subject_lower or 'checkin' in subject_lower
+        return any(token in subject_lower for token in CHECKIN_TOKENS)
     
     def search_calendar(self):
         """Search HR calendar for ALL check-in meetings"""
@@ -63,7 +246,9 @@ class HRCheckInFinder:
         print("1. SEARCHING CALENDAR FOR ALL CHECK-IN MEETINGS")
         print("="*70)
         
-        filter_query = f"start/dateTime ge '{START_DATE}T00:00:00Z'"
+        # Let Graph do the subject matching so only check-ins come back
+        date_filter = f"start/dateTime ge '{START_DATE}T00:00:00Z'"
+        filter_query = f"{date_filter} and (contains(subject,'check-in') or contains(subject,'checkin'))"
         url = f"https://graph.microsoft.com/v1.0/users/{HR_USER_ID}/calendar/events"
         params = {
             '$filter': filter_query,
@@ -77,40 +262,51 @@ class HRCheckInFinder:
         
         while url:
             try:
-                resp = requests.get(url, headers=self.headers, params=params if '?' not in url else None, timeout=30)
+                resp = self._get_with_retry(
+                    url,
+                    params=params if '?' not in url else None,
+                    headers={'Prefer': 'outlook.timezone="UTC"'},
+                    timeout=30
+                )
                 if resp.status_code == 200:
-                    data = resp.json()
+                    data = parse_json(resp)
                     events = data.get('value', [])
                     print(f"  Page {page}: {len(events)} events")
                     
                     for event in events:
-                        subject = event.get('subject', '')
+                        subject = event.get('subject') or ''
                         
-                        # Check for check-in meetings
-                        if self.is_checkin_meeting(subject):
-                            start = event.get('start', {}).get('dateTime', '')[:10]
-                            start_time = event.get('start', {}).get('dateTime', '')[11:19]
-                            online_meeting = event.get('onlineMeeting', {})
-                            join_url = online_meeting.get('joinUrl', '') if online_meeting else ''
-                            
-                            # Get attendees
-                            attendees = event.get('attendees', [])
-                            attendee_names = [a.get('emailAddress', {}).get('name', '') for a in attendees]
-                            
-                            calendar_meetings.append({
-                                'subject': subject,
-                                'date': start,
-                                'time': start_time,
-                                'event_id': event.get('id', ''),
-                                'is_online': event.get('isOnlineMeeting', False),
-                                'join_url': join_url,
-                                'attendees': attendee_names,
-                                'source': 'calendar'
-                            })
+                        # Still checked here: the date-only fallback returns everything
+                        if not self.is_checkin_meeting(subject):
+                            continue
+                        
+                        start = event.get('start', {}).get('dateTime', '')[:10]
+                        start_time = event.get('start', {}).get('dateTime', '')[11:19]
+                        online_meeting = event.get('onlineMeeting', {})
+                        join_url = online_meeting.get('joinUrl', '') if online_meeting else ''
+                        
+                        # Get attendees
+                        attendees = event.get('attendees', [])
+                        attendee_names = [a.get('emailAddress', {}).get('name', '') for a in attendees]
+                        
+                        calendar_meetings.append(CalendarMeeting(
+                            subject=subject,
+                            date=start,
+                            time=start_time,
+                            event_id=event.get('id', ''),
+                            is_online=event.get('isOnlineMeeting', False),
+                            join_url=join_url,
+                            attendees=attendee_names,
+                            source='calendar'
+                        ))
                     
                     url = data.get('@odata.nextLink')
                     params = None
                     page += 1
+                elif resp.status_code == 400 and params and params['$filter'] != date_filter:
+                    # Mailbox rejected the subject filter; fetch by date and filter here
+                    print("  Subject filter not supported, filtering client-side")
+                    params['$filter'] = date_filter
                 else:
                     print(f"  ❌ Error: {resp.status_code}")
                     break
@@ -128,19 +324,20 @@ class HRCheckInFinder:
         print("="*70)
         
         recordings = []
+        seen_ids = set()
         
         # Search in HR user's OneDrive recordings folder
         url = f"https://graph.microsoft.com/v1.0/users/{HR_USER_ID}/drive/root:/Recordings:/children"
-        params = {'$top': 500}
+        params = {'$top': 500, '$select': DRIVE_ITEM_FIELDS}
         
         print("  Searching HR's OneDrive Recordings folder...")
         page = 1
         
         while url:
             try:
-                resp = requests.get(url, headers=self.headers, params=params if '?' not in url else None, timeout=30)
+                resp = self._get_with_retry(url, params=params if '?' not in url else None, timeout=30)
                 if resp.status_code == 200:
-                    data = resp.json()
+                    data = parse_json(resp)
                     items = data.get('value', [])
                     print(f"    Page {page}: {len(items)} items")
                     
@@ -148,20 +345,21 @@ class HRCheckInFinder:
                         name = item.get('name', '')
                         if self.is_checkin_meeting(name):
                             # Parse date from folder/file name
-                            date_match = re.search(r'(\d{4})(\d{2})(\d{2})', name)
-                            date = f"{date_match.group(1)}-{date_match.group(2)}-{date_match.group(3)}" if date_match else ''
+                            date = parse_name_date(name)
                             
                             # Filter by date
-                            if date >= START_DATE:
-                                recordings.append({
-                                    'name': name,
-                                    'date': date,
-                                    'item_id': item.get('id', ''),
-                                    'web_url': item.get('webUrl', ''),
-                                    'size': item.get('size', 0),
-                                    'is_folder': 'folder' in item,
-                                    'source': 'onedrive_hr'
-                                })
+                            item_id = item.get('id', '')
+                            if date >= START_DATE and item_id not in seen_ids:
+                                seen_ids.add(item_id)
+                                recordings.append(DriveRecording(
+                                    name=name,
+                                    date=date,
+                                    item_id=item_id,
+                                    web_url=item.get('webUrl', ''),
+                                    size=item.get('size', 0),
+                                    is_folder='folder' in item,
+                                    source='onedrive_hr'
+                                ))
                     
                     url = data.get('@odata.nextLink')
                     params = None
@@ -176,14 +374,25 @@ class HRCheckInFinder:
                 print(f"    Exception: {e}")
                 break
         
-        # Also search using general drive search
+        # The drive search endpoint is slow; only fall back to it when the
+        # Recordings folder turned up too few check-ins
+        if len(recordings) < ONEDRIVE_SEARCH_THRESHOLD:
+            self._search_onedrive_drive(recordings, seen_ids)
+        else:
+            print("\n  Recordings folder covered the check-ins, skipping drive search")
+        
+        print(f"\n  ✅ Found {len(recordings)} unique check-in recordings in OneDrive")
+        return recordings
+    
+    def _search_onedrive_drive(self, recordings, seen_ids):
+        """Add check-in items from HR's whole-drive search to recordings"""
         print("\n  Searching all OneDrive with Graph search...")
         search_url = f"https://graph.microsoft.com/v1.0/users/{HR_USER_ID}/drive/root/search(q='check-in')"
         
         try:
-            resp = requests.get(search_url, headers=self.headers, timeout=60)
+            resp = self._get_with_retry(search_url, params={'$select': DRIVE_ITEM_FIELDS, '$top': 200}, timeout=60)
             if resp.status_code == 200:
-                data = resp.json()
+                data = parse_json(resp)
                 items = data.get('value', [])
                 print(f"    Found {len(items)} items matching 'check-in'")
                 
@@ -193,32 +402,22 @@ class HRCheckInFinder:
                     if not any(ext in name.lower() for ext in ['.mp4', '.m4a', '.webm']) and 'folder' not in item:
                         continue
                     
-                    date_match = re.search(r'(\d{4})(\d{2})(\d{2})', name)
-                    date = f"{date_match.group(1)}-{date_match.group(2)}-{date_match.group(3)}" if date_match else ''
+                    date = parse_name_date(name)
                     
-                    if date >= START_DATE:
-                        recordings.append({
-                            'name': name,
-                            'date': date,
-                            'item_id': item.get('id', ''),
-                            'web_url': item.get('webUrl', ''),
-                            'size': item.get('size', 0),
-                            'is_folder': 'folder' in item,
-                            'source': 'onedrive_search'
-                        })
+                    item_id = item.get('id', '')
+                    if date >= START_DATE and item_id not in seen_ids:
+                        seen_ids.add(item_id)
+                        recordings.append(DriveRecording(
+                            name=name,
+                            date=date,
+                            item_id=item_id,
+                            web_url=item.get('webUrl', ''),
+                            size=item.get('size', 0),
+                            is_folder='folder' in item,
+                            source='onedrive_search'
+                        ))
         except Exception as e:
             print(f"    Exception: {e}")
-        
-        # Deduplicate by item_id
-        seen_ids = set()
-        unique_recordings = []
-        for rec in recordings:
-            if rec['item_id'] not in seen_ids:
-                seen_ids.add(rec['item_id'])
-                unique_recordings.append(rec)
-        
-        print(f"\n  ✅ Found {len(unique_recordings)} unique check-in recordings in OneDrive")
-        return unique_recordings
     
     def search_local_recordings(self):
         """Search local recordings folder for check-in meetings"""
@@ -233,23 +432,23 @@ class HRCheckInFinder:
             return local_recordings
         
         # Search all subdirectories
-        for item in RECORDINGS_DIR.rglob('*'):
-            if item.is_file() and item.suffix.lower() in ['.mp4', '.m4a', '.webm']:
-                name = item.name
-                if self.is_checkin_meeting(name) or self.is_checkin_meeting(item.parent.name):
-                    date_match = re.search(r'(\d{4})(\d{2})(\d{2})', name)
-                    if not date_match:
-                        date_match = re.search(r'(\d{4})(\d{2})(\d{2})', item.parent.name)
-                    date = f"{date_match.group(1)}-{date_match.group(2)}-{date_match.group(3)}" if date_match else ''
-                    
-                    if date >= START_DATE:
-                        local_recordings.append({
-                            'name': name,
-                            'path': str(item),
-                            'date': date,
-                            'size_mb': round(item.stat().st_size / (1024*1024), 1),
-                            'source': 'local'
-                        })
+        for entry in _walk_files(RECORDINGS_DIR):
+            name = entry.name
+            if not name.lower().endswith(MEDIA_EXTENSIONS):
+                continue
+            parent_name = os.path.basename(os.path.dirname(entry.path))
+            if self.is_checkin_meeting(name) or self.is_checkin_meeting(parent_name):
+                date = parse_name_date(name) or parse_name_date(parent_name)
+                
+                if date >= START_DATE:
+                    local_recordings.append(LocalRecording(
+                        name=name,
+                        path=entry.path,
+                        stem=os.path.splitext(name)[0],
+                        date=date,
+                        size_mb=round(entry.stat().st_size / (1024*1024), 1),
+                        source='local'
+                    ))
         
         print(f"  ✅ Found {len(local_recordings)} check-in recordings locally")
         return local_recordings
@@ -269,16 +468,15 @@ class HRCheckInFinder:
         for item in TRANSCRIPTS_DIR.glob('*.vtt'):
             name = item.name
             if self.is_checkin_meeting(name):
-                date_match = re.search(r'(\d{4})(\d{2})(\d{2})', name)
-                date = f"{date_match.group(1)}-{date_match.group(2)}-{date_match.group(3)}" if date_match else ''
+                date = parse_name_date(name)
                 
                 if date >= START_DATE:
-                    local_transcripts.append({
-                        'name': name,
-                        'path': str(item),
-                        'date': date,
-                        'source': 'local_transcript'
-                    })
+                    local_transcripts.append(LocalTranscript(
+                        name=name,
+                        path=str(item),
+                        date=date,
+                        source='local_transcript'
+                    ))
         
         print(f"  ✅ Found {len(local_transcripts)} check-in transcripts locally")
         return local_transcripts
@@ -290,57 +488,37 @@ class HRCheckInFinder:
         print("="*70)
         
         transcripts = []
+        candidates = []
         
-        # List online meetings for HR user
+        # Phase 1: page through all online meetings collecting check-in candidates
+        # (the listing has no guaranteed order, so every page is read)
         url = f"https://graph.microsoft.com/v1.0/users/{HR_USER_ID}/onlineMeetings"
-        params = {'$top': 100}
+        params = {
+            '$top': 999,
+            '$select': 'id,subject,creationDateTime'
+        }
         
         print("  Fetching online meetings...")
         page = 1
-        meetings_checked = 0
         
-        while url and meetings_checked < 500:
+        while url:
             try:
-                resp = requests.get(url, headers=self.headers, params=params if '?' not in url else None, timeout=30)
+                resp = self._get_with_retry(url, params=params if '?' not in url else None, timeout=30)
                 if resp.status_code == 200:
-                    data = resp.json()
+                    data = parse_json(resp)
                     meetings = data.get('value', [])
                     print(f"    Page {page}: {len(meetings)} meetings")
                     
+                    url = data.get('@odata.nextLink')
                     for meeting in meetings:
-                        subject = meeting.get('subject', '')
-                        if not subject:
+                        creation_time = (meeting.get('creationDateTime') or '')[:10]
+                        if creation_time < START_DATE:
                             continue
-                            
-                        meetings_checked += 1
                         
-                        if self.is_checkin_meeting(subject):
-                            meeting_id = meeting.get('id', '')
-                            creation_time = meeting.get('creationDateTime', '')[:10]
-                            
-                            if creation_time >= START_DATE:
-                                # Check for transcripts
-                                trans_url = f"https://graph.microsoft.com/v1.0/users/{HR_USER_ID}/onlineMeetings/{meeting_id}/transcripts"
-                                try:
-                                    trans_resp = requests.get(trans_url, headers=self.headers, timeout=30)
-                                    if trans_resp.status_code == 200:
-                                        trans_data = trans_resp.json()
-                                        trans_list = trans_data.get('value', [])
-                                        has_transcript = len(trans_list) > 0
-                                    else:
-                                        has_transcript = False
-                                except:
-                                    has_transcript = False
-                                
-                                transcripts.append({
-                                    'subject': subject,
-                                    'meeting_id': meeting_id,
-                                    'date': creation_time,
-                                    'has_transcript': has_transcript,
-                                    'source': 'graph_online_meeting'
-                                })
+                        subject = meeting.get('subject', '')
+                        if subject and self.is_checkin_meeting(subject):
+                            candidates.append((meeting.get('id', ''), subject, creation_time))
                     
-                    url = data.get('@odata.nextLink')
                     params = None
                     page += 1
                 else:
@@ -350,28 +528,141 @@ class HRCheckInFinder:
                 print(f"    Exception: {e}")
                 break
         
+        # Phase 2: check the candidates for transcripts with $batch requests
+        if candidates:
+            print(f"  Checking {len(candidates)} check-in meetings for transcripts...")
+            has_transcripts = self._batch_transcript_checks([c[0] for c in candidates])
+            for meeting_id, subject, creation_time in candidates:
+                transcripts.append(GraphMeeting(
+                    subject=subject,
+                    meeting_id=meeting_id,
+                    date=creation_time,
+                    has_transcript=has_transcripts.get(meeting_id, False),
+                    source='graph_online_meeting'
+                ))
+        
         print(f"\n  ✅ Found {len(transcripts)} check-in meetings via Graph API")
         return transcripts
     
+    def _batch_transcript_checks(self, meeting_ids):
+        """Map meeting_id -> has_transcript, GRAPH_BATCH_SIZE meetings per $batch call"""
+        chunks = [meeting_ids[i:i + GRAPH_BATCH_SIZE] for i in range(0, len(meeting_ids), GRAPH_BATCH_SIZE)]
+        has_transcripts = {}
+        if AIOHTTP_AVAILABLE:
+            for result in asyncio.run(self._check_transcripts_async(chunks)):
+                has_transcripts.update(result)
+        else:
+            with ThreadPoolExecutor(max_workers=PROBE_WORKERS) as executor:
+                for result in executor.map(self._check_transcript_batch, chunks):
+                    has_transcripts.update(result)
+        return has_transcripts
+    
+    def _build_transcript_batch(self, meeting_ids):
+        """Build the $batch body for transcript lookups, keyed by request id"""
+        by_id = {str(i): mid for i, mid in enumerate(meeting_ids)}
+        body = {'requests': [
+            {
+                'id': req_id,
+                'method': 'GET',
+                'url': f"/users/{HR_USER_ID}/onlineMeetings/{mid}/transcripts"
+            }
+            for req_id, mid in by_id.items()
+        ]}
+        return by_id, body
+    
+    def _parse_transcript_batch(self, responses, by_id, results, attempt):
+        """Record sub-responses in results; return (throttled meeting ids, seconds to wait)"""
+        throttled = []
+        retry_after = 0
+        for sub in responses:
+            meeting_id = by_id.get(sub.get('id'))
+            if meeting_id is None:
+                continue
+            status = sub.get('status')
+            if status == 200:
+                results[meeting_id] = len((sub.get('body') or {}).get('value', [])) > 0
+            elif status in (429, 503):
+                throttled.append(meeting_id)
+                headers = sub.get('headers') or {}
+                retry_after = max(retry_after, retry_after_seconds(headers.get('Retry-After'), 2 ** attempt))
+            else:
+                results[meeting_id] = False
+        return throttled, retry_after
+    
+    def _check_transcript_batch(self, meeting_ids, max_attempts=5):
+        """Check one chunk of meetings, re-sending throttled sub-requests after Retry-After"""
+        results = {}
+        pending = list(meeting_ids)
+        
+        for attempt in range(max_attempts):
+            by_id, body = self._build_transcript_batch(pending)
+            try:
+                resp = self.session.post('https://graph.microsoft.com/v1.0/$batch', json=body, timeout=60)
+                if resp.status_code != 200:
+                    raise RuntimeError(f"batch returned {resp.status_code}")
+                responses = parse_json(resp).get('responses', [])
+            except Exception as e:
+                print(f"    Batch exception: {e}")
+                break
+            
+            pending, retry_after = self._parse_transcript_batch(responses, by_id, results, attempt)
+            if not pending:
+                break
+            time.sleep(retry_after)
+        
+        for meeting_id in meeting_ids:
+            results.setdefault(meeting_id, False)
+        return results
+    
+    async def _check_transcript_batch_async(self, http, semaphore, meeting_ids, max_attempts=5):
+        """aiohttp variant of _check_transcript_batch"""
+        results = {}
+        pending = list(meeting_ids)
+        
+        for attempt in range(max_attempts):
+            by_id, body = self._build_transcript_batch(pending)
+            async with semaphore:
+                try:
+                    async with http.post('https://graph.microsoft.com/v1.0/$batch', json=body) as resp:
+                        if resp.status != 200:
+                            raise RuntimeError(f"batch returned {resp.status}")
+                        responses = (await resp.json()).get('responses', [])
+                except Exception as e:
+                    print(f"    Batch exception: {e}")
+                    break
+            
+            pending, retry_after = self._parse_transcript_batch(responses, by_id, results, attempt)
+            if not pending:
+                break
+            await asyncio.sleep(retry_after)
+        
+        for meeting_id in meeting_ids:
+            results.setdefault(meeting_id, False)
+        return results
+    
+    async def _check_transcripts_async(self, chunks):
+        """Run all transcript $batch calls on one event loop, PROBE_WORKERS in flight"""
+        semaphore = asyncio.Semaphore(PROBE_WORKERS)
+        connector = aiohttp.TCPConnector(limit=PROBE_WORKERS)
+        timeout = aiohttp.ClientTimeout(total=60)
+        headers = {'Authorization': f'Bearer {self.token}', 'Accept': 'application/json'}
+        async with aiohttp.ClientSession(headers=headers, connector=connector, timeout=timeout) as http:
+            return await asyncio.gather(
+                *(self._check_transcript_batch_async(http, semaphore, chunk) for chunk in chunks)
+            )
+    
     def extract_hr_person(self, subject):
         """Extract HR person name from subject like 'Integration Team Check-in Louise x Irvy'"""
-        patterns = [
-            r'Check-in\s+(\w+)\s+x\s+\w+',  # "Check-in Louise x Irvy"
-            r'Check-in\s+(\w+)\s+x',         # "Check-in Shey xAnn"
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, subject, re.IGNORECASE)
+        for pattern in _HR_PERSON_RES:
+            match = pattern.search(subject)
             if match:
                 return match.group(1)
         return None
     
     def extract_va_name(self, subject):
         """Extract VA name from subject"""
-        patterns = [
-            r'x\s+([A-Za-z]+(?:\s+[A-Za-z]+)?)',  # "x Irvy" or "x Jon Jevi"
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, subject, re.IGNORECASE)
+        for pattern in _VA_NAME_RES:
+            match = pattern.search(subject)
             if match:
                 return match.group(1).strip()
         return None
@@ -385,7 +676,13 @@ class HRCheckInFinder:
         print("="*70 + "\n")
         
         self.authenticate()
-        
+        try:
+            return self._run_searches()
+        finally:
+            self.session.close()
+    
+    def _run_searches(self):
+        """Run every search and save the combined results"""
         results = {
             'search_date': datetime.now().isoformat(),
             'start_date': START_DATE,
@@ -397,12 +694,27 @@ class HRCheckInFinder:
             'summary': {}
         }
         
-        # Run all searches
-        results['calendar_meetings'] = self.search_calendar()
-        results['onedrive_recordings'] = self.search_onedrive_recordings()
-        results['local_recordings'] = self.search_local_recordings()
-        results['local_transcripts'] = self.search_local_transcripts()
-        results['graph_transcripts'] = self.search_graph_transcripts()
+        # Run all searches concurrently: the local scans are disk-bound and
+        # overlap with the network-bound Graph ones. Each search's output is
+        # buffered and printed in order so sections don't interleave.
+        searches = {
+            'calendar_meetings': self.search_calendar,
+            'onedrive_recordings': self.search_onedrive_recordings,
+            'local_recordings': self.search_local_recordings,
+            'local_transcripts': self.search_local_transcripts,
+            'graph_transcripts': self.search_graph_transcripts,
+        }
+        real_stdout = sys.stdout
+        output = PhaseOutput(real_stdout)
+        sys.stdout = output
+        try:
+            with ThreadPoolExecutor(max_workers=len(searches)) as executor:
+                futures = {key: executor.submit(output.capture, search) for key, search in searches.items()}
+                for key, future in futures.items():
+                    results[key], text = future.result()
+                    real_stdout.write(text)
+        finally:
+            sys.stdout = real_stdout
         
         # Analyze by HR person
         print("\n" + "="*70)
@@ -419,7 +731,7 @@ class HRCheckInFinder:
         )
         
         for meeting in all_meetings:
-            subject = meeting.get('subject', meeting.get('name', ''))
+            subject = meeting.subject if hasattr(meeting, 'subject') else meeting.name
             hr_person = self.extract_hr_person(subject)
             if hr_person:
                 hr_counts[hr_person] = hr_counts.get(hr_person, 0) + 1
@@ -455,25 +767,22 @@ class HRCheckInFinder:
         print("="*70)
         
         # Get existing transcripts
-        existing_transcripts = set()
-        for t in results['local_transcripts']:
-            existing_transcripts.add(t['name'].replace('.vtt', ''))
-        
-        needs_transcription = []
-        for rec in results['local_recordings']:
-            base_name = Path(rec['path']).stem
-            if base_name not in existing_transcripts:
-                needs_transcription.append(rec)
+        existing_transcripts = {Path(t.name).stem for t in results['local_transcripts']}
+        needs_transcription = [
+            rec for rec in results['local_recordings']
+            if rec.stem not in existing_transcripts
+        ]
         
         print(f"\n  Recordings needing transcription: {len(needs_transcription)}")
         if needs_transcription:
             for rec in needs_transcription[:20]:
-                print(f"    - {rec['name']} ({rec['size_mb']} MB)")
+                print(f"    - {rec.name} ({rec.size_mb} MB)")
         
         # Save results
+        for key in searches:
+            results[key] = [asdict(item) for item in results[key]]
         output_file = OUTPUT_DIR / f'hr_checkin_meetings_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
+        output_file.write_bytes(dump_json_bytes(results))
         print(f"\n💾 Results saved to: {output_file}")
         
         return results
@@ -16,10 +16,32 @@ import sys
 import json
 import requests
 import re
-from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from datetime import datetime, timedelta
 from pathlib import Path
-from azure.identity import ClientSecretCredential
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from azure.identity import ClientSecretCredential, TokenCachePersistenceOptions
 from dotenv import load_dotenv
+from phase_output import PhaseOutput
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
 
 load_dotenv()
 
@@ -30,6 +52,15 @@ CLIENT_SECRET = os.getenv('AZURE_CLIENT_SECRET')
 
 HR_USER_ID = '81835016-79d5-4a15-91b1-c104e2cd9adb'
 
+# Persist the Graph token between runs in the OS-encrypted store (keyring,
+# DPAPI, Keychain) so each invocation doesn't repeat the Azure AD round trip.
+# Where no encrypted store exists the token is not cached at all, unless
+# GRAPH_TOKEN_CACHE_PLAINTEXT=1 explicitly allows writing it to disk unencrypted.
+TOKEN_CACHE_OPTIONS = TokenCachePersistenceOptions(
+    name='teams_ontology',
+    allow_unencrypted_storage=os.getenv('GRAPH_TOKEN_CACHE_PLAINTEXT') == '1'
+)
+
 # Paths
 OUTPUT_DIR = Path('output')
 RECORDINGS_DIR = Path('recordings')
@@ -37,73 +68,313 @@ TRANSCRIPTS_DIR = Path('transcripts')
 
 START_DATE = '2025-11-01'
 
+# Meeting subject cache (meeting_id -> subject), persisted between runs
+MEETING_SUBJECTS_CACHE = OUTPUT_DIR / 'meeting_subjects.json'
+MEETING_SUBJECTS_TTL_HOURS = 24
+
+# Concurrent per-user Recordings folder lookups
+USER_SCAN_WORKERS = 20
+
+# Only the drive item fields the Recordings scan reads
+RECORDING_FIELDS = 'id,name,createdDateTime,size,webUrl,@microsoft.graph.downloadUrl'
+
+# Drive delta links per user, so later runs only fetch Recordings changes
+DELTA_STATE_FILE = OUTPUT_DIR / '.delta_tokens.json'
+DELTA_FIELDS = 'id,name,createdDateTime,size,webUrl,parentReference,deleted'
+
+# Users whose drive had no Recordings folder; rebuilt once the file is a week old
+NO_RECORDINGS_FILE = OUTPUT_DIR / '.no_recordings.json'
+NO_RECORDINGS_TTL_DAYS = 7
+
+# Graph JSON batching accepts at most 20 sub-requests per $batch call
+GRAPH_BATCH_SIZE = 20
+
+# Concurrent $batch calls
+BATCH_WORKERS = 8
+
+# Name/subject matching, compiled once for the scan loops
+_RECORDING_NAME_RE = re.compile(r'(\d{8})_(\d{6})_(.+)')
+_TRANSCRIPT_NAME_RE = re.compile(r'(\d{8})_(\d{6})_(.+)\.vtt')
+_VA_RE = re.compile(r'louise\s*x\s*([A-Za-z]+)', re.IGNORECASE)
+
+# Check-in keywords as one automaton: a single C-level pass per name instead
+# of up to three substring scans
+if AHOCORASICK_AVAILABLE:
+    _CHECKIN_AUTOMATON = ahocorasick.Automaton()
+    for _keyword in ('louise', 'check-in', 'checkin'):
+        _CHECKIN_AUTOMATON.add_word(_keyword, _keyword)
+    _CHECKIN_AUTOMATON.make_automaton()
+
+# Send a duplicate of a slow idempotent GET after this long and take whichever
+# copy answers first (cuts tail latency from Graph-side queuing)
+HEDGE_AFTER_SECONDS = 1.0
+HEDGE_WORKERS = 16
+
+# Calendar pages fetched concurrently via $skip once the first page shows
+# there is more than one
+CALENDAR_PAGE_SIZE = 500
+CALENDAR_PAGE_WORKERS = 4
+
+
+def recordings_path(user_id):
+    """Graph path (relative to the version root) listing a user's Recordings folder"""
+    return f"/users/{user_id}/drive/root:/Recordings:/children?$top=500&$select={RECORDING_FIELDS}"
+
+
+def _stored_item(item):
+    """Recordings item fields kept in the delta state (download URLs expire, so not those)"""
+    return {field: item.get(field) for field in ('id', 'name', 'createdDateTime', 'size', 'webUrl')}
+
+
+def dump_json_bytes(data):
+    """Serialize a report to indented UTF-8 JSON bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2, default=str)
+    return json.dumps(data, indent=2, default=str).encode('utf-8')
+
+
+def iter_page(resp, page):
+    """Yield the items of a Graph page's 'value', streamed with ijson if available.
+    
+    Once the items are exhausted page['next'] holds the @odata.nextLink
+    (None on the last page). Without ijson the page is parsed whole.
+    """
+    page['next'] = None
+    if not IJSON_AVAILABLE:
+        data = resp.json()
+        page['next'] = data.get('@odata.nextLink')
+        yield from data.get('value', [])
+        return
+    
+    resp.raw.decode_content = True
+    builder = None
+    for prefix, event, value in ijson.parse(resp.raw):
+        if builder is not None:
+            builder.event(event, value)
+            if prefix == 'value.item' and event == 'end_map':
+                yield builder.value
+                builder = None
+        elif prefix == 'value.item' and event == 'start_map':
+            builder = ijson.ObjectBuilder()
+            builder.event(event, value)
+        elif prefix == '@odata.nextLink':
+            page['next'] = value
+
+
+def is_louise_checkin(text):
+    """True if a subject or file name is a Louise check-in"""
+    text_lower = text.lower()
+    if AHOCORASICK_AVAILABLE:
+        hits = {keyword for _, keyword in _CHECKIN_AUTOMATON.iter(text_lower)}
+        return 'louise' in hits and ('check-in' in hits or 'checkin' in hits)
+    return 'louise' in text_lower and ('check-in' in text_lower or 'checkin' in text_lower)
+
+
+def extract_va(subject):
+    """VA name from 'Louise x <VA>' in a subject or file name"""
+    match = _VA_RE.search(str(subject))
+    return match.group(1) if match else 'Unknown'
+
+
+def _discard_response(future):
+    """Close the response of a hedged request that lost the race"""
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
 
 class LouiseCheckInFinder:
     def __init__(self):
-        self.credential = ClientSecretCredential(TENANT_ID, CLIENT_ID, CLIENT_SECRET)
+        try:
+            self.credential = ClientSecretCredential(
+                TENANT_ID, CLIENT_ID, CLIENT_SECRET,
+                cache_persistence_options=TOKEN_CACHE_OPTIONS
+            )
+        except ValueError:
+            # No encrypted token store on this machine
+            self.credential = ClientSecretCredential(TENANT_ID, CLIENT_ID, CLIENT_SECRET)
         self.token = None
         self.headers = None
         self.louise_meetings = []
         
+        # Pooled session for every Graph call. Throttled (429 + Retry-After) and
+        # unavailable responses are retried, including the $batch POSTs.
+        self.session = requests.Session()
+        retry_strategy = Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=[429, 503],
+            allowed_methods=['GET', 'POST'],
+            respect_retry_after_header=True
+        )
+        self.session.mount('https://', HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=retry_strategy))
+        # Hedged GETs must not sit out a Retry-After inside urllib3, or the
+        # backup copy would land on a tenant that is already throttling us
+        self._hedge_session = requests.Session()
+        self._hedge_session.mount('https://', HTTPAdapter(
+            pool_connections=HEDGE_WORKERS, pool_maxsize=HEDGE_WORKERS,
+            max_retries=Retry(total=3, status_forcelist=[], allowed_methods=['GET'])
+        ))
+        self._hedge_pool = ThreadPoolExecutor(max_workers=HEDGE_WORKERS)
+        self._meeting_cache = self._load_meeting_cache()
+        
     def authenticate(self):
         print("Authenticating with Microsoft Graph API...")
-        self.token = self.credential.get_token('https://graph.microsoft.com/.default').token
+        try:
+            self.token = self.credential.get_token('https://graph.microsoft.com/.default').token
+        except ValueError as e:
+            # The encrypted token store can also turn out to be unusable on first use
+            print(f"  Token cache unavailable ({e}), continuing without it")
+            self.credential = ClientSecretCredential(TENANT_ID, CLIENT_ID, CLIENT_SECRET)
+            self.token = self.credential.get_token('https://graph.microsoft.com/.default').token
         self.headers = {
             'Authorization': f'Bearer {self.token}',
             'Content-Type': 'application/json'
         }
         print("✅ Authenticated\n")
     
+    def _load_meeting_cache(self):
+        """Meeting subjects (meeting_id -> subject) from earlier runs, if still fresh"""
+        if not MEETING_SUBJECTS_CACHE.exists():
+            return {}
+        age = datetime.now() - datetime.fromtimestamp(MEETING_SUBJECTS_CACHE.stat().st_mtime)
+        if age > timedelta(hours=MEETING_SUBJECTS_TTL_HOURS):
+            return {}
+        try:
+            with open(MEETING_SUBJECTS_CACHE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"  Could not read meeting subject cache: {e}")
+            return {}
+    
+    def _save_meeting_cache(self):
+        """Persist meeting subjects for the next run"""
+        try:
+            with open(MEETING_SUBJECTS_CACHE, 'w', encoding='utf-8') as f:
+                json.dump(self._meeting_cache, f, indent=2)
+        except Exception as e:
+            print(f"  Could not write meeting subject cache: {e}")
+    
+    def hedged_get(self, url, hedge_after=HEDGE_AFTER_SECONDS, **kwargs):
+        """GET url; if no answer within hedge_after seconds, race a second copy.
+        
+        Only for idempotent reads. The slower copy is left to finish and closed.
+        A throttled (429/503) answer is retried once through the main session,
+        which waits out Retry-After, instead of being raced.
+        """
+        primary = self._hedge_pool.submit(self._hedge_session.get, url, **kwargs)
+        done, _ = wait([primary], timeout=hedge_after)
+        if done:
+            return self._unthrottled(primary.result(), url, **kwargs)
+        
+        backup = self._hedge_pool.submit(self._hedge_session.get, url, **kwargs)
+        futures = [primary, backup]
+        winner = primary
+        for future in as_completed(futures):
+            if future.exception() is None:
+                winner = future
+                break
+        for future in futures:
+            if future is not winner:
+                future.add_done_callback(_discard_response)
+        return self._unthrottled(winner.result(), url, **kwargs)
+    
+    def _unthrottled(self, resp, url, **kwargs):
+        """resp, or a retry via the Retry-After-aware session if it was throttled"""
+        if resp.status_code not in (429, 503):
+            return resp
+        resp.close()
+        return self.session.get(url, **kwargs)
+    
     def search_calendar(self):
         """Search HR calendar for Louise check-in meetings"""
         print("="*70)
         print("1. SEARCHING CALENDAR FOR LOUISE CHECK-INS")
         print("="*70)
         
-        filter_query = f"start/dateTime ge '{START_DATE}T00:00:00Z'"
+        date_filter = f"start/dateTime ge '{START_DATE}T00:00:00Z'"
+        # Let Graph drop non-Louise events before they cross the wire
+        # (contains() on subject is case-insensitive)
+        filter_query = f"{date_filter} and contains(subject,'louise')"
         url = f"https://graph.microsoft.com/v1.0/users/{HR_USER_ID}/calendar/events"
         params = {
             '$filter': filter_query,
             '$select': 'id,subject,start,end,organizer,isOnlineMeeting,onlineMeeting',
-            '$top': 500,
+            '$top': CALENDAR_PAGE_SIZE,
             '$orderby': 'start/dateTime desc'
         }
         
         louise_calendar = []
         
-        while url:
-            try:
-                resp = requests.get(url, headers=self.headers, params=params if '?' not in url else None, timeout=30)
-                if resp.status_code == 200:
-                    data = resp.json()
-                    events = data.get('value', [])
-                    
-                    for event in events:
-                        subject = event.get('subject', '')
-                        subject_lower = subject.lower()
-                        
-                        # Check for Louise check-in meetings
-                        if 'louise' in subject_lower and ('check-in' in subject_lower or 'checkin' in subject_lower):
-                            start = event.get('start', {}).get('dateTime', '')[:10]
-                            online_meeting = event.get('onlineMeeting', {})
-                            join_url = online_meeting.get('joinUrl', '') if online_meeting else ''
-                            
-                            louise_calendar.append({
-                                'subject': subject,
-                                'date': start,
-                                'event_id': event.get('id', ''),
-                                'is_online': event.get('isOnlineMeeting', False),
-                                'join_url': join_url
-                            })
+        def get_page(skip):
+            page_params = dict(params, **{'$skip': skip}) if skip else params
+            return self.session.get(url, headers=self.headers, params=page_params, timeout=30, stream=True)
+        
+        def add_events(events):
+            for event in events:
+                subject = event.get('subject', '')
+                
+                # Check for Louise check-in meetings
+                if is_louise_checkin(subject):
+                    start = event.get('start', {}).get('dateTime', '')[:10]
+                    online_meeting = event.get('onlineMeeting', {})
+                    join_url = online_meeting.get('joinUrl', '') if online_meeting else ''
                     
-                    url = data.get('@odata.nextLink')
-                    params = None
-                else:
-                    print(f"  Error: {resp.status_code}")
-                    break
-            except Exception as e:
-                print(f"  Error: {e}")
-                break
+                    louise_calendar.append({
+                        'subject': subject,
+                        'date': start,
+                        'event_id': event.get('id', ''),
+                        'is_online': event.get('isOnlineMeeting', False),
+                        'join_url': join_url
+                    })
+        
+        try:
+            resp = get_page(0)
+            if resp.status_code == 400:
+                # Mailbox rejected the subject filter; fetch by date and filter here
+                print("  Subject filter not supported, filtering client-side")
+                resp.close()
+                params['$filter'] = date_filter
+                resp = get_page(0)
+            if resp.status_code == 200:
+                page = {}
+                add_events(iter_page(resp, page))
+                more = page['next'] is not None
+            else:
+                print(f"  Error: {resp.status_code}")
+                resp.close()
+                more = False
+        except Exception as e:
+            print(f"  Error: {e}")
+            more = False
+        
+        # The ordering is fixed, so later pages are addressable by $skip and a
+        # window of them can be in flight at once instead of one nextLink at a time
+        skip = CALENDAR_PAGE_SIZE
+        with ThreadPoolExecutor(max_workers=CALENDAR_PAGE_WORKERS) as executor:
+            while more:
+                offsets = [skip + i * CALENDAR_PAGE_SIZE for i in range(CALENDAR_PAGE_WORKERS)]
+                futures = [executor.submit(get_page, offset) for offset in offsets]
+                skip = offsets[-1] + CALENDAR_PAGE_SIZE
+                for future in futures:
+                    try:
+                        resp = future.result()
+                    except Exception as e:
+                        print(f"  Error: {e}")
+                        more = False
+                        break
+                    if resp.status_code != 200:
+                        print(f"  Error: {resp.status_code}")
+                        more = False
+                        break
+                    page = {}
+                    add_events(iter_page(resp, page))
+                    if page['next'] is None:
+                        more = False
+                        break
+                # Responses are streamed: release every connection in the window,
+                # including pages past the end that were never read
+                for future in futures:
+                    future.add_done_callback(_discard_response)
         
         print(f"  Found {len(louise_calendar)} Louise check-in meetings in calendar")
         
@@ -125,7 +396,7 @@ class LouiseCheckInFinder:
         users_url = "https://graph.microsoft.com/v1.0/users?$select=id,displayName,mail&$top=100"
         
         try:
-            resp = requests.get(users_url, headers=self.headers, timeout=30)
+            resp = self.session.get(users_url, headers=self.headers, timeout=30)
             if resp.status_code != 200:
                 print(f"  Error getting users: {resp.status_code}")
                 return []
@@ -137,49 +408,103 @@ class LouiseCheckInFinder:
             return []
         
         louise_recordings = []
-        start_date = datetime.strptime(START_DATE, '%Y-%m-%d')
+        by_user = {}
+        delta_state = self._load_delta_state()
+        
+        # Users seen on an earlier run: apply only what changed in their drive
+        synced_users = [user for user in users if user['id'] in delta_state]
+        list_users = [user for user in users if user['id'] not in delta_state]
+        with ThreadPoolExecutor(max_workers=USER_SCAN_WORKERS) as executor:
+            synced = executor.map(lambda u: self._sync_user_delta(delta_state[u['id']]), synced_users)
+            for user, ok in zip(synced_users, synced):
+                if ok:
+                    items = delta_state[user['id']]['items'].values()
+                    by_user[user['id']] = self._louise_recordings(items, user)
+                else:
+                    # Delta link expired (410) or failed: start over from a listing
+                    del delta_state[user['id']]
+                    list_users.append(user)
+        if synced_users:
+            print(f"  {len(by_user)} users synced from delta links, {len(list_users)} listed")
         
+        # Most users never record: skip the ones a recent run found without a
+        # Recordings folder, and probe the rest for its id before anything else
+        no_recordings = self._load_no_recordings()
+        probe_users = [user for user in list_users if user['id'] not in no_recordings]
+        skipped = len(list_users) - len(probe_users)
+        if skipped:
+            print(f"  Skipping {skipped} users without a Recordings folder")
+        folder_requests = [
+            {'id': str(i), 'method': 'GET', 'url': f"/users/{user['id']}/drive/root:/Recordings?$select=id"}
+            for i, user in enumerate(probe_users)
+        ]
+        folder_ids = {}
+        list_users = []
+        for req_id, status, body in sorted(self._graph_batch(folder_requests), key=lambda r: int(r[0])):
+            user = probe_users[int(req_id)]
+            if status == 200:
+                folder_ids[user['id']] = body.get('id')
+                list_users.append(user)
+            elif status == 404:
+                no_recordings.add(user['id'])
+            else:
+                # Unknown: list anyway, the listing below retries failures
+                list_users.append(user)
+        self._save_no_recordings(no_recordings)
+        
+        # Users with recordings: take a delta token *before* listing, so nothing
+        # created in between is missed
+        seed_requests = [
+            {'id': str(i), 'method': 'GET',
+             'url': f"/users/{user['id']}/drive/root/delta?token=latest&$select={DELTA_FIELDS}"}
+            for i, user in enumerate(list_users)
+        ]
+        delta_links = {}
+        for req_id, status, body in self._graph_batch(seed_requests):
+            if status == 200:
+                delta_links[int(req_id)] = body.get('@odata.deltaLink')
+        
+        # One $batch sub-request per user's Recordings folder
+        batch_requests = [
+            {
+                'id': str(i),
+                'method': 'GET',
+                'url': recordings_path(user['id'])
+            }
+            for i, user in enumerate(list_users)
+        ]
+        retry_users = []
+        for req_id, status, body in self._graph_batch(batch_requests):
+            user = list_users[int(req_id)]
+            if status == 200:
+                items = body.get('value', [])
+                by_user[user['id']] = self._louise_recordings(items, user)
+                delta_link = delta_links.get(int(req_id))
+                folder_id = folder_ids.get(user['id'])
+                if delta_link and folder_id and '@odata.nextLink' not in body:
+                    delta_state[user['id']] = {
+                        'delta_link': delta_link,
+                        'folder_id': folder_id,
+                        'items': {item['id']: _stored_item(item) for item in items}
+                    }
+            elif status is None or status == 429 or status >= 500:
+                # Throttled, transient or the batch call failed: retry this user singly
+                retry_users.append(user)
+            # 404 and others: no Recordings folder
+        
+        # Single-user retries go through the session's Retry-After handling
+        with ThreadPoolExecutor(max_workers=USER_SCAN_WORKERS) as executor:
+            for user, recordings in zip(retry_users, executor.map(self._fetch_user_recordings, retry_users)):
+                by_user[user['id']] = recordings
+        
+        self._save_delta_state(delta_state)
+        
+        # Keep results in user order, as the serial loop did
         for user in users:
-            user_id = user['id']
-            user_name = user.get('displayName', 'Unknown')
-            
-            # Search Recordings folder
-            url = f"https://graph.microsoft.com/v1.0/users/{user_id}/drive/root:/Recordings:/children?$top=500"
-            
-            try:
-                resp = requests.get(url, headers=self.headers, timeout=30)
-                if resp.status_code == 200:
-                    items = resp.json().get('value', [])
-                    
-                    for item in items:
-                        name = item.get('name', '')
-                        name_lower = name.lower()
-                        
-                        # Check for Louise check-in
-                        if 'louise' in name_lower and ('check-in' in name_lower or 'checkin' in name_lower):
-                            created = item.get('createdDateTime', '')
-                            
-                            # Check date
-                            if created:
-                                try:
-                                    created_date = datetime.fromisoformat(created.replace('Z', '+00:00'))
-                                    if created_date.replace(tzinfo=None) >= start_date:
-                                        louise_recordings.append({
-                                            'name': name,
-                                            'date': created[:10],
-                                            'user_id': user_id,
-                                            'user_name': user_name,
-                                            'file_id': item.get('id', ''),
-                                            'size_mb': item.get('size', 0) / 1024 / 1024,
-                                            'web_url': item.get('webUrl', ''),
-                                            'download_url': item.get('@microsoft.graph.downloadUrl', '')
-                                        })
-                                except:
-                                    pass
-                elif resp.status_code != 404:
-                    pass  # No Recordings folder
-            except:
-                pass
+            louise_recordings.extend(by_user.get(user['id'], []))
+        
+        # Recordings served from the delta state carry no download URL
+        self._fill_download_urls(louise_recordings)
         
         print(f"  Found {len(louise_recordings)} Louise recordings in OneDrive")
         
@@ -188,6 +513,160 @@ class LouiseCheckInFinder:
         
         return louise_recordings
     
+    def _fill_download_urls(self, recordings):
+        """Fetch fresh pre-signed download URLs for recordings that lack one.
+        
+        The URLs expire within the hour, so they are never stored in the delta
+        state; only the Louise hits are looked up, 20 per $batch call.
+        """
+        missing = [r for r in recordings if not r.get('download_url')]
+        batch_requests = [
+            {
+                'id': str(i),
+                'method': 'GET',
+                'url': f"/users/{r['user_id']}/drive/items/{r['file_id']}?$select=id,@microsoft.graph.downloadUrl"
+            }
+            for i, r in enumerate(missing)
+        ]
+        for req_id, status, body in self._graph_batch(batch_requests):
+            if status == 200:
+                missing[int(req_id)]['download_url'] = body.get('@microsoft.graph.downloadUrl', '')
+    
+    def _load_delta_state(self):
+        """Per-user drive delta links and Recordings items from earlier runs"""
+        if not DELTA_STATE_FILE.exists():
+            return {}
+        try:
+            with open(DELTA_STATE_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"  Could not read delta state: {e}")
+            return {}
+    
+    def _save_delta_state(self, delta_state):
+        """Persist delta links and Recordings items for the next run"""
+        try:
+            DELTA_STATE_FILE.write_bytes(dump_json_bytes(delta_state))
+        except Exception as e:
+            print(f"  Could not write delta state: {e}")
+    
+    def _load_no_recordings(self):
+        """User ids without a Recordings folder, empty once the list is stale"""
+        try:
+            age = datetime.now() - datetime.fromtimestamp(NO_RECORDINGS_FILE.stat().st_mtime)
+            if age > timedelta(days=NO_RECORDINGS_TTL_DAYS):
+                return set()
+            with open(NO_RECORDINGS_FILE, 'r', encoding='utf-8') as f:
+                return set(json.load(f))
+        except FileNotFoundError:
+            return set()
+        except Exception as e:
+            print(f"  Could not read no-recordings list: {e}")
+            return set()
+    
+    def _save_no_recordings(self, no_recordings):
+        """Write the no-Recordings list, keeping the mtime of a fresh file so
+        the weekly rebuild still happens"""
+        try:
+            stat = NO_RECORDINGS_FILE.stat() if NO_RECORDINGS_FILE.exists() else None
+            NO_RECORDINGS_FILE.write_bytes(dump_json_bytes(sorted(no_recordings)))
+            if stat and datetime.now() - datetime.fromtimestamp(stat.st_mtime) <= timedelta(days=NO_RECORDINGS_TTL_DAYS):
+                os.utime(NO_RECORDINGS_FILE, (stat.st_atime, stat.st_mtime))
+        except Exception as e:
+            print(f"  Could not write no-recordings list: {e}")
+    
+    def _sync_user_delta(self, entry):
+        """Apply drive changes since entry's delta link to its Recordings items.
+        
+        Delta responses omit parentReference.path, so items are matched to the
+        Recordings folder by parent id. Returns False if the link is no longer
+        usable and the user must be listed again.
+        """
+        items = entry['items']
+        url = entry['delta_link']
+        while url:
+            try:
+                resp = self.session.get(url, headers=self.headers, timeout=30)
+            except:
+                return False
+            if resp.status_code != 200:
+                return False
+            data = resp.json()
+            for item in data.get('value', []):
+                item_id = item.get('id')
+                parent_id = (item.get('parentReference') or {}).get('id')
+                if item.get('deleted') or parent_id != entry['folder_id']:
+                    items.pop(item_id, None)
+                else:
+                    items[item_id] = _stored_item(item)
+            url = data.get('@odata.nextLink')
+            entry['delta_link'] = data.get('@odata.deltaLink', entry['delta_link'])
+        return True
+    
+    def _fetch_user_recordings(self, user):
+        """Return Louise check-in recordings from one user's Recordings folder"""
+        url = f"https://graph.microsoft.com/v1.0{recordings_path(user['id'])}"
+        
+        try:
+            resp = self.session.get(url, headers=self.headers, timeout=30)
+        except:
+            return []
+        if resp.status_code != 200:
+            return []  # No Recordings folder
+        return self._louise_recordings(resp.json().get('value', []), user)
+    
+    def _louise_recordings(self, items, user):
+        """Pick Louise check-in recordings since START_DATE out of a Recordings listing"""
+        user_id = user['id']
+        user_name = user.get('displayName', 'Unknown')
+        
+        louise_recordings = []
+        for item in items:
+            name = item.get('name', '')
+            
+            # Check for Louise check-in
+            if is_louise_checkin(name):
+                created = item.get('createdDateTime', '')
+                
+                # Check date (Graph timestamps are UTC ISO 8601, so the
+                # date prefix compares correctly as a string)
+                if created and created[:10] >= START_DATE:
+                    louise_recordings.append({
+                        'name': name,
+                        'date': created[:10],
+                        'user_id': user_id,
+                        'user_name': user_name,
+                        'file_id': item.get('id', ''),
+                        'size_mb': item.get('size', 0) / 1024 / 1024,
+                        'web_url': item.get('webUrl', ''),
+                        'download_url': item.get('@microsoft.graph.downloadUrl', '')
+                    })
+        
+        return louise_recordings
+    
+    def _graph_batch(self, requests_list, version='v1.0'):
+        """POST sub-requests to $batch, GRAPH_BATCH_SIZE per call and calls in parallel.
+        
+        Yields (id, status, body) per sub-request. If a whole batch call fails its
+        sub-requests are yielded with status None so callers can fall back.
+        """
+        batch_url = f"https://graph.microsoft.com/{version}/$batch"
+        chunks = [requests_list[i:i + GRAPH_BATCH_SIZE] for i in range(0, len(requests_list), GRAPH_BATCH_SIZE)]
+        
+        def send(chunk):
+            try:
+                resp = self.session.post(batch_url, headers=self.headers, json={'requests': chunk}, timeout=60)
+                if resp.status_code == 200:
+                    return resp.json().get('responses', [])
+            except:
+                pass
+            return [{'id': req['id'], 'status': None} for req in chunk]
+        
+        with ThreadPoolExecutor(max_workers=BATCH_WORKERS) as executor:
+            for responses in executor.map(send, chunks):
+                for sub in responses:
+                    yield sub.get('id'), sub.get('status'), sub.get('body') or {}
+    
     def search_local_recordings(self):
         """Search local recordings folder"""
         print("\n" + "="*70)
@@ -197,30 +676,38 @@ class LouiseCheckInFinder:
         louise_local = []
         start_date = datetime.strptime(START_DATE, '%Y-%m-%d')
         
-        for item in RECORDINGS_DIR.iterdir():
+        # 'YYYYMMDD_HHMMSS' prefixes of existing transcripts, read once
+        vtt_prefixes = set()
+        if TRANSCRIPTS_DIR.exists():
+            with os.scandir(TRANSCRIPTS_DIR) as it:
+                vtt_prefixes = {entry.name[:15] for entry in it if entry.name.endswith('.vtt')}
+        
+        # DirEntry caches the file type from the directory read, so no extra stat per entry
+        entries = []
+        if RECORDINGS_DIR.exists():
+            with os.scandir(RECORDINGS_DIR) as it:
+                entries = list(it)
+        
+        for item in entries:
             name = item.name
-            name_lower = name.lower()
-            
-            if 'louise' not in name_lower:
-                continue
-            if 'check-in' not in name_lower and 'checkin' not in name_lower:
+            if not is_louise_checkin(name):
                 continue
             
             # Extract date
-            match = re.match(r'(\d{8})_(\d{6})_(.+)', name)
+            match = _RECORDING_NAME_RE.match(name)
             if match:
                 date_str = match.group(1)
                 try:
                     date = datetime.strptime(date_str, '%Y%m%d')
                     if date >= start_date:
                         # Check for transcript
-                        has_vtt = any(TRANSCRIPTS_DIR.glob(f"{date_str}_{match.group(2)}*.vtt"))
+                        has_vtt = f"{date_str}_{match.group(2)}" in vtt_prefixes
                         
                         # Get file size
                         if item.is_file():
                             size = item.stat().st_size / 1024 / 1024
                         else:
-                            mp4s = list(item.glob('*.mp4'))
+                            mp4s = list(Path(item.path).glob('*.mp4'))
                             size = mp4s[0].stat().st_size / 1024 / 1024 if mp4s else 0
                         
                         louise_local.append({
@@ -228,7 +715,7 @@ class LouiseCheckInFinder:
                             'date': date.strftime('%Y-%m-%d'),
                             'has_transcript': has_vtt,
                             'size_mb': size,
-                            'path': str(item)
+                            'path': item.path
                         })
                 except:
                     pass
@@ -252,15 +739,11 @@ class LouiseCheckInFinder:
         
         for vtt in TRANSCRIPTS_DIR.glob('*.vtt'):
             name = vtt.name
-            name_lower = name.lower()
-            
-            if 'louise' not in name_lower:
-                continue
-            if 'check-in' not in name_lower and 'checkin' not in name_lower:
+            if not is_louise_checkin(name):
                 continue
             
             # Extract date
-            match = re.match(r'(\d{8})_(\d{6})_(.+)\.vtt', name)
+            match = _TRANSCRIPT_NAME_RE.match(name)
             if match:
                 date_str = match.group(1)
                 try:
@@ -273,7 +756,7 @@ class LouiseCheckInFinder:
                         })
                 except:
                     pass
-            elif name.startswith('unknown_') and 'louise' in name_lower:
+            elif name.startswith('unknown_'):
                 louise_transcripts.append({
                     'name': name,
                     'date': 'Unknown',
@@ -297,43 +780,26 @@ class LouiseCheckInFinder:
         url = f"https://graph.microsoft.com/beta/users/{HR_USER_ID}/onlineMeetings/getAllTranscripts(meetingOrganizerUserId='{HR_USER_ID}')"
         
         louise_api_transcripts = []
-        start_date = datetime.strptime(START_DATE, '%Y-%m-%d')
+        candidates = []
         
         while url:
             try:
-                resp = requests.get(url, headers=self.headers, timeout=30)
+                resp = self.hedged_get(url, headers=self.headers, timeout=30, stream=True)
                 if resp.status_code == 200:
-                    data = resp.json()
-                    transcripts = data.get('value', [])
-                    
-                    for t in transcripts:
+                    page = {}
+                    for t in iter_page(resp, page):
                         # We need to check meeting details
-                        meeting_id = t.get('meetingId', '')
                         created = t.get('createdDateTime', '')
                         
-                        if created:
-                            try:
-                                created_date = datetime.fromisoformat(created.replace('Z', '+00:00'))
-                                if created_date.replace(tzinfo=None) >= start_date:
-                                    # Get meeting details to check subject
-                                    meeting_url = f"https://graph.microsoft.com/beta/users/{HR_USER_ID}/onlineMeetings/{meeting_id}"
-                                    meeting_resp = requests.get(meeting_url, headers=self.headers, timeout=10)
-                                    
-                                    if meeting_resp.status_code == 200:
-                                        meeting = meeting_resp.json()
-                                        subject = meeting.get('subject', '')
-                                        
-                                        if 'louise' in subject.lower() and ('check-in' in subject.lower() or 'checkin' in subject.lower()):
-                                            louise_api_transcripts.append({
-                                                'subject': subject,
-                                                'date': created[:10],
-                                                'transcript_id': t.get('id', ''),
-                                                'meeting_id': meeting_id
-                                            })
-                            except:
-                                pass
+                        # Keep only the fields used below, not whole transcript objects
+                        if created and created[:10] >= START_DATE:
+                            candidates.append({
+                                'id': t.get('id', ''),
+                                'meetingId': t.get('meetingId', ''),
+                                'createdDateTime': created
+                            })
                     
-                    url = data.get('@odata.nextLink')
+                    url = page['next']
                 else:
                     print(f"  Error: {resp.status_code}")
                     break
@@ -341,6 +807,37 @@ class LouiseCheckInFinder:
                 print(f"  Error: {e}")
                 break
         
+        # Get meeting details to check subjects: each meeting at most once, only
+        # those not cached from an earlier run, 20 meetings per $batch call
+        missing = list(dict.fromkeys(
+            t.get('meetingId', '') for t in candidates
+            if t.get('meetingId', '') not in self._meeting_cache
+        ))
+        batch_requests = [
+            {
+                'id': str(i),
+                'method': 'GET',
+                'url': f"/users/{HR_USER_ID}/onlineMeetings/{meeting_id}?$select=subject"
+            }
+            for i, meeting_id in enumerate(missing)
+        ]
+        for req_id, status, body in self._graph_batch(batch_requests, version='beta'):
+            if status == 200:
+                self._meeting_cache[missing[int(req_id)]] = body.get('subject', '')
+        self._save_meeting_cache()
+        
+        for t in candidates:
+            subject = self._meeting_cache.get(t.get('meetingId', ''))
+            if subject is None:
+                continue
+            if is_louise_checkin(subject):
+                louise_api_transcripts.append({
+                    'subject': subject,
+                    'date': t.get('createdDateTime', '')[:10],
+                    'transcript_id': t.get('id', ''),
+                    'meeting_id': t.get('meetingId', '')
+                })
+        
         print(f"  Found {len(louise_api_transcripts)} Louise transcripts via Graph API")
         
         for t in louise_api_transcripts:
@@ -357,10 +854,6 @@ class LouiseCheckInFinder:
         # Create master list by date + VA name
         all_meetings = {}
         
-        def extract_va(subject):
-            match = re.search(r'louise\s*x\s*([A-Za-z]+)', str(subject), re.IGNORECASE)
-            return match.group(1) if match else 'Unknown'
-        
         # Add calendar events
         for m in calendar:
             va = extract_va(m['subject'])
@@ -499,8 +992,7 @@ class LouiseCheckInFinder:
         }
         
         output_path = OUTPUT_DIR / f'louise_checkins_report_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
-        with open(output_path, 'w') as f:
-            json.dump(report, f, indent=2, default=str)
+        output_path.write_bytes(dump_json_bytes(report))
         print(f"\n✅ Report saved to: {output_path.name}")
         
         return can_transcribe
@@ -510,12 +1002,30 @@ def main():
     finder = LouiseCheckInFinder()
     finder.authenticate()
     
-    # Search all sources
-    calendar = finder.search_calendar()
-    onedrive = finder.search_onedrive_all_users()
-    local_rec = finder.search_local_recordings()
-    local_trans = finder.search_local_transcripts()
-    api_trans = finder.search_graph_transcripts()
+    # Search all sources concurrently: the Graph searches are network-bound and
+    # the local scans disk-bound. Each search's output is buffered and printed
+    # in order so sections don't interleave.
+    searches = [
+        finder.search_calendar,
+        finder.search_onedrive_all_users,
+        finder.search_local_recordings,
+        finder.search_local_transcripts,
+        finder.search_graph_transcripts,
+    ]
+    real_stdout = sys.stdout
+    output = PhaseOutput(real_stdout)
+    sys.stdout = output
+    try:
+        with ThreadPoolExecutor(max_workers=len(searches)) as executor:
+            futures = [executor.submit(output.capture, search) for search in searches]
+            found = []
+            for future in futures:
+                result, text = future.result()
+                real_stdout.write(text)
+                found.append(result)
+    finally:
+        sys.stdout = real_stdout
+    calendar, onedrive, local_rec, local_trans, api_trans = found
     
     # Find what can be transcribed
     to_transcribe = finder.consolidate_and_find_gaps(calendar, onedrive, local_rec, local_trans, api_trans)
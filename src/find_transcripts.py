@@ -1,23 +1,40 @@
 """Search for DOCX and VTT transcript files matching MP4 recordings."""
-import requests
-import os
-from dotenv import load_dotenv
-from azure.identity import ClientSecretCredential
+from bisect import bisect_left
+from find_louise_checkins import LouiseCheckInFinder
 
-load_dotenv()
 
-credential = ClientSecretCredential(
-    tenant_id=os.getenv('AZURE_TENANT_ID'),
-    client_id=os.getenv('AZURE_CLIENT_ID'),
-    client_secret=os.getenv('AZURE_CLIENT_SECRET')
-)
+def index_by_base(files, ext):
+    """Map base name (extension stripped) -> file name, plus the sorted base names"""
+    by_base = {}
+    for name, _ in files:
+        by_base.setdefault(name.replace(ext, ''), name)
+    return by_base, sorted(by_base)
 
-token = credential.get_token('https://graph.microsoft.com/.default')
-headers = {'Authorization': f'Bearer {token.token}'}
+
+def match_transcript(base_name, by_base, sorted_bases):
+    """File whose base equals, extends, or is contained in base_name (None if none)"""
+    if base_name in by_base:
+        return by_base[base_name]
+    # Teams names the transcript like the recording plus a suffix: prefix lookup
+    i = bisect_left(sorted_bases, base_name)
+    if i < len(sorted_bases) and sorted_bases[i].startswith(base_name):
+        return by_base[sorted_bases[i]]
+    # Rare irregular names: fall back to a substring scan
+    for base in sorted_bases:
+        if base_name in base or base in base_name:
+            return by_base[base]
+    return None
+
+
+# Reuse the Louise finder's persisted token cache and pooled session
+finder = LouiseCheckInFinder()
+finder.authenticate()
+session = finder.session
+headers = finder.headers
 
 # Get HR user
 print("Finding HR user...")
-resp = requests.get('https://graph.microsoft.com/v1.0/users', headers=headers)
+resp = session.get('https://graph.microsoft.com/v1.0/users', headers=headers)
 users = resp.json().get('value', [])
 hr_user = None
 for u in users:
@@ -39,7 +56,7 @@ print('Listing ALL files in Recordings folder...')
 print('='*60)
 
 url = f'https://graph.microsoft.com/v1.0/users/{user_id}/drive/root:/Recordings:/children?$top=500'
-resp = requests.get(url, headers=headers)
+resp = session.get(url, headers=headers)
 
 if resp.status_code == 200:
     items = resp.json().get('value', [])
@@ -100,30 +117,30 @@ if resp.status_code == 200:
         print('CHECKING FOR TRANSCRIPT MATCHES:')
         print('='*60)
         
+        # Index transcripts by base name once instead of rescanning per recording
+        vtt_by_base, vtt_bases = index_by_base(vtt_files, '.vtt')
+        docx_by_base, docx_bases = index_by_base(docx_files, '.docx')
+        
         matches = 0
         for mp4_name, _ in mp4_files[:20]:
             # Get base name without extension and common suffixes
             base_name = mp4_name.replace('.mp4', '').replace('-Meeting Recording', '')
             
             # Look for matching VTT
-            for vtt_name, _ in vtt_files:
-                vtt_base = vtt_name.replace('.vtt', '')
-                if base_name in vtt_base or vtt_base in base_name:
-                    print(f'  ✅ MATCH:')
-                    print(f'     MP4:  {mp4_name[:60]}...')
-                    print(f'     VTT:  {vtt_name}')
-                    matches += 1
-                    break
+            vtt_name = match_transcript(base_name, vtt_by_base, vtt_bases)
+            if vtt_name:
+                print(f'  ✅ MATCH:')
+                print(f'     MP4:  {mp4_name[:60]}...')
+                print(f'     VTT:  {vtt_name}')
+                matches += 1
             
             # Look for matching DOCX
-            for docx_name, _ in docx_files:
-                docx_base = docx_name.replace('.docx', '')
-                if base_name in docx_base or docx_base in base_name:
-                    print(f'  ✅ MATCH:')
-                    print(f'     MP4:  {mp4_name[:60]}...')
-                    print(f'     DOCX: {docx_name}')
-                    matches += 1
-                    break
+            docx_name = match_transcript(base_name, docx_by_base, docx_bases)
+            if docx_name:
+                print(f'  ✅ MATCH:')
+                print(f'     MP4:  {mp4_name[:60]}...')
+                print(f'     DOCX: {docx_name}')
+                matches += 1
         
         print(f'\nTotal matches found: {matches}')
     else:
@@ -138,29 +155,15 @@ print('\n' + '='*60)
 print('Searching entire OneDrive for transcript files...')
 print('='*60)
 
-# Search for VTT files
-search_url = f"https://graph.microsoft.com/v1.0/users/{user_id}/drive/root/search(q='transcript')"
-resp = requests.get(search_url, headers=headers)
-if resp.status_code == 200:
-    results = resp.json().get('value', [])
-    if results:
-        print(f'\nFound {len(results)} files matching "transcript":')
-        for item in results[:15]:
-            name = item.get('name', '')
-            path = item.get('parentReference', {}).get('path', '')
-            print(f'  • {name}')
-            print(f'    Path: {path}')
-    else:
-        print('No files found matching "transcript"')
-else:
-    print(f'Search error: {resp.status_code}')
-
-# Search for .vtt extension
+# Search for .vtt files first: they are the transcripts we want, so the
+# broader 'transcript' keyword search only runs if none turn up
+vtt_found = False
 search_url = f"https://graph.microsoft.com/v1.0/users/{user_id}/drive/root/search(q='.vtt')"
-resp = requests.get(search_url, headers=headers)
+resp = session.get(search_url, headers=headers)
 if resp.status_code == 200:
     results = resp.json().get('value', [])
     if results:
+        vtt_found = True
         print(f'\nFound {len(results)} .vtt files:')
         for item in results[:15]:
             name = item.get('name', '')
@@ -170,3 +173,22 @@ if resp.status_code == 200:
             print(f'    Path: {path}')
     else:
         print('No .vtt files found')
+else:
+    print(f'Search error: {resp.status_code}')
+
+if not vtt_found:
+    search_url = f"https://graph.microsoft.com/v1.0/users/{user_id}/drive/root/search(q='transcript')"
+    resp = session.get(search_url, headers=headers)
+    if resp.status_code == 200:
+        results = resp.json().get('value', [])
+        if results:
+            print(f'\nFound {len(results)} files matching "transcript":')
+            for item in results[:15]:
+                name = item.get('name', '')
+                path = item.get('parentReference', {}).get('path', '')
+                print(f'  • {name}')
+                print(f'    Path: {path}')
+        else:
+            print('No files found matching "transcript"')
+    else:
+        print(f'Search error: {resp.status_code}')
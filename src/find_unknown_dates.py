@@ -5,89 +5,192 @@ Searches recordings folder and transcript content to find dates for meetings
 that have 'unknown_' prefix in their transcript filenames.
 """
 
+import os
 import re
+import json
+import calendar
+import mmap
 import pandas as pd
 from pathlib import Path
 from datetime import datetime
+from collections import Counter
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from difflib import SequenceMatcher
 
+try:
+    from rapidfuzz import fuzz, process
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
 OUTPUT_DIR = Path('output')
 RECORDINGS_DIR = Path('recordings')
 TRANSCRIPTS_DIR = Path('transcripts')
 
+# Parsed recordings listing, reused while the folder's mtime is unchanged
+RECORDINGS_INDEX = OUTPUT_DIR / '.recordings_index.json'
+
+# Subject/name patterns, compiled once for the per-meeting loops
+_SUBJECT_PREFIX_RE = re.compile(r'^(Integration Team Check-in|OurAssistants|Daily EOD Check in|Daily SOD Check in)\s*', re.IGNORECASE)
+_HR_PERSON_RE = re.compile(r'(Shey|Louise)\s*x?\s*', re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r'\s+')
+_RECORDING_NAME_RE = re.compile(r'(\d{8})_(\d{6})_(.+)')
+
+# Date references in transcript text: December 5, 2025 or Dec 5, 2025 (one
+# scan for both spellings), then 12/5/2025. Bytes patterns, matched against
+# the memory-mapped UTF-8 file without decoding it; bytes \s is ASCII-only, so
+# the UTF-8 encodings of Unicode whitespace (NBSP, thin space, ...) are spelled out
+_UTF8_SPACE = (rb'(?:[\s\x1c-\x1f]|\xc2[\x85\xa0]|\xe1\x9a\x80|\xe2\x80[\x80-\x8a\xa8\xa9\xaf]'
+               rb'|\xe2\x81\x9f|\xe3\x80\x80)+')
+_CONTENT_DATE_PATTERNS = [
+    re.compile(rb'(January|February|March|April|May|June|July|August|September|October|November|December'
+               rb'|Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)' + _UTF8_SPACE
+               + rb'(\d{1,2}),?' + _UTF8_SPACE + rb'(\d{4})'),
+    re.compile(rb'(\d{1,2})/(\d{1,2})/(\d{4})'),
+]
+
+def _iso_date(date_str):
+    """'YYYYMMDD' as 'YYYY-MM-DD' by slicing, or None if it isn't a real calendar date"""
+    year, month, day = int(date_str[:4]), int(date_str[4:6]), int(date_str[6:8])
+    if year < 1 or not 1 <= month <= 12 or not 1 <= day <= calendar.monthrange(year, month)[1]:
+        return None
+    return f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:8]}"
+
 def similar(a, b):
     """Calculate similarity ratio between two strings"""
-    return SequenceMatcher(None, a.lower(), b.lower()).ratio()
+    a, b = a.lower(), b.lower()
+    # Meetings with the same VA share key names; no need to run the matcher
+    if a == b:
+        return 1.0
+    return _ratio(a, b)
+
+@lru_cache(maxsize=4096)
+def _ratio(a, b):
+    """Similarity ratio of two lower-cased strings, memoized per pair"""
+    if RAPIDFUZZ_AVAILABLE:
+        # Indel (LCS) similarity, 2*LCS/(len(a)+len(b)), computed in C++. It is
+        # never below SequenceMatcher's matching-blocks ratio and often above
+        # it, so the same thresholds admit somewhat more matches
+        return fuzz.ratio(a, b) / 100.0
+    return SequenceMatcher(None, a, b).ratio()
+
+@lru_cache(maxsize=8192)
+def _char_counts(text):
+    """Character histogram of a lower-cased string"""
+    return Counter(text)
 
+@lru_cache(maxsize=8192)
 def extract_key_name(subject):
     """Extract the key identifier from a meeting subject"""
     # Remove common prefixes
-    subject = re.sub(r'^(Integration Team Check-in|OurAssistants|Daily EOD Check in|Daily SOD Check in)\s*', '', subject, flags=re.IGNORECASE)
+    subject = _SUBJECT_PREFIX_RE.sub('', subject)
     # Remove 'Shey x', 'Louise x', etc.
-    subject = re.sub(r'(Shey|Louise)\s*x?\s*', '', subject, flags=re.IGNORECASE)
+    subject = _HR_PERSON_RE.sub('', subject)
     # Clean up
-    subject = re.sub(r'\s+', ' ', subject).strip()
+    subject = _WHITESPACE_RE.sub(' ', subject).strip()
     return subject
 
+@lru_cache(maxsize=None)
+def recording_entries():
+    """(date_str, recording_subject, name, name_words) for each timestamped item
+    in recordings, listed and parsed once per run.
+    
+    The parsed listing is kept in RECORDINGS_INDEX and only rebuilt when the
+    folder's mtime (which changes on any add, remove or rename) has moved.
+    """
+    try:
+        mtime = RECORDINGS_DIR.stat().st_mtime
+    except FileNotFoundError:
+        # No recordings folder: nothing to match against
+        return []
+    parsed = None
+    try:
+        with open(RECORDINGS_INDEX, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get('mtime') == mtime:
+            parsed = index['entries']
+    except (OSError, ValueError, KeyError):
+        pass
+    
+    if parsed is None:
+        parsed = []
+        # Get all MP4 files and folders in recordings named YYYYMMDD_...
+        for item in RECORDINGS_DIR.glob('[0-9]' * 8 + '_*'):
+            name = item.name
+            
+            # Extract date from name
+            match = _RECORDING_NAME_RE.match(name)
+            if not match:
+                continue
+            
+            recording_subject = match.group(3).replace('.mp4', '').replace('.wav', '')
+            parsed.append([match.group(1), recording_subject, name])
+        try:
+            with open(RECORDINGS_INDEX, 'w', encoding='utf-8') as f:
+                json.dump({'mtime': mtime, 'entries': parsed}, f)
+        except OSError:
+            pass
+    
+    return [
+        (date_str, recording_subject, name, frozenset(name.lower().split()))
+        for date_str, recording_subject, name in parsed
+    ]
+
 def find_date_in_recordings(subject):
     """Search recordings folder for matching meeting"""
     key_name = extract_key_name(subject)
+    key_len = len(key_name)
+    key_chars = _char_counts(key_name.lower())
+    
+    subject_words = set(subject.lower().split())
     
     best_match = None
     best_score = 0
     
-    # Get all MP4 files and folders in recordings
-    for item in RECORDINGS_DIR.iterdir():
-        name = item.name
-        
-        # Extract date from name
-        match = re.match(r'(\d{8})_(\d{6})_(.+)', name)
-        if not match:
-            continue
-        
-        date_str = match.group(1)
-        recording_subject = match.group(3).replace('.mp4', '').replace('.wav', '')
-        
-        # Check similarity
+    for date_str, recording_subject, name, name_words in recording_entries():
         rec_key = extract_key_name(recording_subject)
-        score = similar(key_name, rec_key)
         
         # Also check if subject words appear in recording name
-        subject_words = set(subject.lower().split())
-        name_words = set(name.lower().split())
         common_words = subject_words & name_words
         word_score = len(common_words) / max(len(subject_words), 1)
         
+        # The ratio can't exceed 2*min/total for these lengths; skip the
+        # matcher when even that couldn't beat the threshold or best so far
+        total_len = key_len + len(rec_key)
+        max_score = 2 * min(key_len, len(rec_key)) / total_len if total_len else 1.0
+        if not RAPIDFUZZ_AVAILABLE and total_len:
+            # difflib is slow enough to be worth a tighter bound: only the
+            # characters both names share can ever be matched
+            shared = key_chars & _char_counts(rec_key.lower())
+            max_score = 2 * sum(shared.values()) / total_len
+        if (max_score + word_score) / 2 <= max(best_score, 0.4):
+            continue
+        
+        # Check similarity
+        score = similar(key_name, rec_key)
+        
         combined_score = (score + word_score) / 2
         
         if combined_score > best_score and combined_score > 0.4:
             best_score = combined_score
-            try:
-                date = datetime.strptime(date_str, '%Y%m%d').strftime('%Y-%m-%d')
+            date = _iso_date(date_str)
+            if date:
                 best_match = (date, name, combined_score)
-            except:
-                pass
     
     return best_match
 
 def find_date_in_transcript_content(vtt_path):
     """Search inside VTT file for date references"""
     try:
-        with open(vtt_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Look for date patterns in the content
-        # Pattern: December 5, 2025 or Dec 5, 2025 or 12/5/2025
-        patterns = [
-            r'(January|February|March|April|May|June|July|August|September|October|November|December)\s+(\d{1,2}),?\s+(\d{4})',
-            r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+(\d{1,2}),?\s+(\d{4})',
-            r'(\d{1,2})/(\d{1,2})/(\d{4})',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, content)
-            if match:
-                return match.group(0)
+        # Pages are read in as the patterns scan; an empty file can't be
+        # mapped and lands in the except like an unreadable one
+        with open(vtt_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+            # Look for date patterns in the content
+            for pattern in _CONTENT_DATE_PATTERNS:
+                match = pattern.search(content)
+                if match:
+                    return match.group(0).decode('utf-8')
         
         return None
     except:
@@ -108,6 +211,31 @@ def find_date_from_other_transcripts(subject, df):
     
     return None, None
 
+def find_dates_from_other_transcripts(subjects, df):
+    """find_date_from_other_transcripts for many subjects at once.
+    
+    With rapidfuzz every unknown/known key pair is scored in one cdist call;
+    returns a (date, subject) pair per input subject, (None, None) if no match.
+    """
+    known_dates = df[df['Date'] != 'Unknown']
+    if not RAPIDFUZZ_AVAILABLE or known_dates.empty or not subjects:
+        return [find_date_from_other_transcripts(subject, df) for subject in subjects]
+    
+    unknown_keys = [extract_key_name(subject).lower() for subject in subjects]
+    known_keys = [extract_key_name(subject).lower() for subject in known_dates['Subject']]
+    scores = process.cdist(unknown_keys, known_keys, scorer=fuzz.ratio, score_cutoff=80, workers=-1)
+    
+    # First known row over the threshold, as the row-by-row scan returned
+    hits = scores > 80
+    first_hit = hits.argmax(axis=1)
+    results = []
+    for row_hits, j in zip(hits, first_hit):
+        if row_hits[j]:
+            results.append((known_dates['Date'].iat[j], known_dates['Subject'].iat[j]))
+        else:
+            results.append((None, None))
+    return results
+
 def main():
     print("="*70)
     print("FINDING DATES FOR UNKNOWN MEETINGS")
@@ -120,48 +248,65 @@ def main():
     
     found_dates = []
     
-    for idx, row in unknown.iterrows():
-        subject = row['Subject']
-        transcript_file = row['Transcript File']
-        
-        print(f"\n[{len(found_dates)+1}/{len(unknown)}] {subject}")
+    # Method 3 candidates for every unknown meeting, scored in one pass
+    similar_meetings = dict(zip(unknown.index, find_dates_from_other_transcripts(unknown['Subject'].tolist(), df)))
+    
+    # Build (or load) the recordings index before the workers share it
+    if len(unknown):
+        recording_entries()
+    
+    def search(idx, subject, transcript_file):
+        """Methods 1 and 2 for one unknown meeting: (found or None, report lines)"""
+        lines = []
         
         # Method 1: Search recordings folder
         recording_match = find_date_in_recordings(subject)
         if recording_match:
             date, matched_file, score = recording_match
-            print(f"  ✓ Found in recordings: {date} (score: {score:.2f})")
-            print(f"    Matched: {matched_file[:60]}...")
-            found_dates.append({
+            lines.append(f"  ✓ Found in recordings: {date} (score: {score:.2f})")
+            lines.append(f"    Matched: {matched_file[:60]}...")
+            return {
                 'idx': idx,
                 'subject': subject,
                 'date': date,
                 'source': 'recordings',
                 'matched_to': matched_file
-            })
-            continue
+            }, lines
         
         # Method 2: Check transcript content for date references
         vtt_path = TRANSCRIPTS_DIR / transcript_file
         content_date = find_date_in_transcript_content(vtt_path)
         if content_date:
-            print(f"  ✓ Found date reference in transcript: {content_date}")
-            found_dates.append({
+            lines.append(f"  ✓ Found date reference in transcript: {content_date}")
+            return {
                 'idx': idx,
                 'subject': subject,
                 'date': content_date,
                 'source': 'transcript_content',
                 'matched_to': None
-            })
-            continue
+            }, lines
         
-        # Method 3: Look for same VA in other meetings
-        similar_date, similar_subject = find_date_from_other_transcripts(subject, df)
-        if similar_date:
-            print(f"  ~ Found similar meeting: {similar_subject[:50]}... ({similar_date})")
-            # Don't auto-apply this - just note it
-        
-        print(f"  ✗ Could not find date")
+        return None, lines
+    
+    # Meetings are searched in parallel (file reads and rapidfuzz release
+    # the GIL) and reported in sheet order
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        results = executor.map(search, unknown.index, unknown['Subject'], unknown['Transcript File'])
+        for idx, subject, (found, lines) in zip(unknown.index, unknown['Subject'], results):
+            print(f"\n[{len(found_dates)+1}/{len(unknown)}] {subject}")
+            for line in lines:
+                print(line)
+            if found:
+                found_dates.append(found)
+                continue
+            
+            # Method 3: Look for same VA in other meetings
+            similar_date, similar_subject = similar_meetings[idx]
+            if similar_date:
+                print(f"  ~ Found similar meeting: {similar_subject[:50]}... ({similar_date})")
+                # Don't auto-apply this - just note it
+            
+            print(f"  ✗ Could not find date")
     
     # Summary
     print("\n" + "="*70)
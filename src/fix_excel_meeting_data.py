@@ -9,6 +9,7 @@ Fix Excel Meeting Data
 """
 
 import re
+import numpy as np
 import pandas as pd
 from pathlib import Path
 from datetime import datetime
@@ -17,128 +18,83 @@ from datetime import datetime
 OUTPUT_DIR = Path('output')
 EXCEL_PATH = OUTPUT_DIR / 'meeting_transcripts_latest_analyzed.xlsx'
 
-
-def extract_date_from_filename(filename):
-    """Extract date from transcript filename like 20251204_154721_..."""
-    if not filename or pd.isna(filename):
-        return None
-    
-    # Pattern: YYYYMMDD_HHMMSS_...
-    match = re.match(r'(\d{8})_(\d{6})_', str(filename))
-    if match:
-        date_str = match.group(1)
-        try:
-            return datetime.strptime(date_str, '%Y%m%d').strftime('%Y-%m-%d')
-        except:
-            pass
-    return None
-
-
-def extract_time_from_filename(filename):
-    """Extract time from transcript filename"""
-    if not filename or pd.isna(filename):
-        return None
-    
-    match = re.match(r'\d{8}_(\d{6})_', str(filename))
-    if match:
-        time_str = match.group(1)
-        try:
-            return f"{time_str[:2]}:{time_str[2:4]}:{time_str[4:6]}"
-        except:
-            pass
-    return None
-
-
-def determine_meeting_type(subject):
-    """Determine meeting type from subject"""
-    if not subject or pd.isna(subject):
-        return "Unknown"
-    
-    subject_lower = str(subject).lower()
-    
-    if 'check-in' in subject_lower or 'checkin' in subject_lower:
-        return "Check-in"
-    elif 'interview' in subject_lower:
-        return "Interview"
-    elif 'orientation' in subject_lower:
-        return "Orientation"
-    elif 'onboarding' in subject_lower:
-        return "Onboarding"
-    elif 'readiness' in subject_lower:
-        return "Readiness Check"
-    elif 'gtm' in subject_lower:
-        return "GTM"
-    elif 'catch up' in subject_lower or 'catchup' in subject_lower:
-        return "Catch-up"
-    elif 'eod' in subject_lower:
-        return "EOD Check-in"
-    elif 'sod' in subject_lower:
-        return "SOD Check-in"
-    else:
-        return "Other"
-
-
-def extract_hr_person(subject):
-    """Extract HR person from subject (Shey, Louise, or HR)"""
-    if not subject or pd.isna(subject):
-        return ""
-    
-    subject_lower = str(subject).lower()
-    
-    # Check for Shey
-    if 'shey' in subject_lower:
-        return "Shey"
-    
-    # Check for Louise
-    if 'louise' in subject_lower:
-        return "Louise"
-    
-    # Check for other HR indicators
-    if 'hr' in subject_lower:
-        return "HR"
-    
-    # For interviews, the HR person is typically the organizer
-    # Check common patterns
-    if 'integration team' in subject_lower:
-        # Try to extract from pattern "Shey x Name" or "Louise x Name"
-        match = re.search(r'(shey|louise)\s*x', subject_lower)
-        if match:
-            return match.group(1).title()
-    
-    return ""
-
-
-def extract_va_name(subject):
-    """Extract VA name from check-in meeting subject"""
-    if not subject or pd.isna(subject):
-        return ""
-    
-    subject_str = str(subject)
-    
-    # Pattern 1: "Check-in Shey x VAName" or "Check-in Louise x VAName"
-    match = re.search(r'(?:shey|louise)\s*x\s*([A-Za-z]+(?:\s+[A-Za-z]+)?)', subject_str, re.IGNORECASE)
-    if match:
-        return match.group(1).strip()
-    
-    # Pattern 2: "Check-in Shey xVAName" (no space after x)
-    match = re.search(r'(?:shey|louise)\s*x([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)', subject_str)
-    if match:
-        return match.group(1).strip()
-    
-    # Pattern 3: For interviews, extract name after "Interview -"
-    match = re.search(r'interview\s*[-:]\s*([A-Za-z]+(?:\s+[A-Za-z]+)?(?:\s+[A-Za-z]+)?)', subject_str, re.IGNORECASE)
-    if match:
-        name = match.group(1).strip()
-        # Clean up common suffixes
-        name = re.sub(r'\s*[-]\s*(VA|PM|MC|APM|PMA|HOA|Bookkeeper|Accountant).*', '', name, flags=re.IGNORECASE)
-        return name
-    
-    # Pattern 4: "Catch up with Name"
-    match = re.search(r'catch\s*up\s*with\s+([A-Za-z]+(?:\s+(?:and|&)\s+[A-Za-z]+)?)', subject_str, re.IGNORECASE)
-    if match:
-        return match.group(1).strip()
-    
-    return ""
+# Filename/subject patterns, compiled once for the per-row passes
+# (anchored: Series.str.extract searches rather than matches)
+_FILENAME_DATETIME_RE = re.compile(r'^(\d{8})_(\d{6})_')
+_FILENAME_SUBJECT_RE = re.compile(r'^\d{8}_\d{6}_(.+)\.vtt')
+# VA name: "Shey x Name"/"Louise xName", "Interview - Name" or "Catch up with Name"
+_VA_NAME_RE = re.compile(
+    r'(?:shey|louise)\s*x\s*(?P<checkin>[A-Za-z]+(?:\s+[A-Za-z]+)?)'
+    r'|interview\s*[-:]\s*(?P<interview>[A-Za-z]+(?:\s+[A-Za-z]+)?(?:\s+[A-Za-z]+)?)'
+    r'|catch\s*up\s*with\s+(?P<catchup>[A-Za-z]+(?:\s+(?:and|&)\s+[A-Za-z]+)?)',
+    re.IGNORECASE
+)
+_ROLE_SUFFIX_RE = re.compile(r'\s*[-]\s*(VA|PM|MC|APM|PMA|HOA|Bookkeeper|Accountant).*', re.IGNORECASE)
+
+# Subject keywords -> label, first match wins
+_MEETING_TYPES = [
+    (('check-in', 'checkin'), "Check-in"),
+    (('interview',), "Interview"),
+    (('orientation',), "Orientation"),
+    (('onboarding',), "Onboarding"),
+    (('readiness',), "Readiness Check"),
+    (('gtm',), "GTM"),
+    (('catch up', 'catchup'), "Catch-up"),
+    (('eod',), "EOD Check-in"),
+    (('sod',), "SOD Check-in"),
+]
+_HR_PERSONS = [
+    ('shey', "Shey"),
+    ('louise', "Louise"),
+    ('hr', "HR"),
+]
+
+
+def _missing(subjects):
+    """Mask of empty or missing subjects"""
+    return subjects.isna() | (subjects == '')
+
+
+def determine_meeting_types(subjects):
+    """Meeting type per subject: the first _MEETING_TYPES keyword match,
+    'Other' if none matches and 'Unknown' for missing subjects.
+    
+    Recurring meetings repeat their subject, so the keyword masks are built
+    over the distinct subjects only and mapped back onto the column by dict.
+    """
+    distinct = pd.Series(subjects.dropna().unique())
+    distinct_lower = distinct.astype(str).str.lower()
+    conditions = [(distinct == '').to_numpy()]
+    choices = ["Unknown"]
+    for keywords, meeting_type in _MEETING_TYPES:
+        mask = np.zeros(len(distinct), dtype=bool)
+        for keyword in keywords:
+            mask |= distinct_lower.str.contains(keyword, regex=False).to_numpy()
+        conditions.append(mask)
+        choices.append(meeting_type)
+    labels = dict(zip(distinct, np.select(conditions, choices, default="Other").tolist()))
+    return subjects.map(labels).fillna("Unknown")
+
+
+def extract_hr_persons(subjects):
+    """HR person per subject: Shey, Louise or HR by keyword, '' otherwise"""
+    subjects_lower = subjects.astype(str).str.lower()
+    conditions = [_missing(subjects).to_numpy()]
+    choices = [""]
+    for keyword, hr_person in _HR_PERSONS:
+        conditions.append(subjects_lower.str.contains(keyword, regex=False).to_numpy())
+        choices.append(hr_person)
+    return pd.Series(np.select(conditions, choices, default="").tolist(), index=subjects.index)
+
+
+def extract_va_names(subjects):
+    """VA name per subject from "Shey/Louise x Name", "Interview - Name" or
+    "Catch up with Name", '' if none matches"""
+    parts = subjects.astype(str).str.extract(_VA_NAME_RE)
+    parts['interview'] = parts['interview'].str.strip().str.replace(_ROLE_SUFFIX_RE, '', regex=True)
+    names = parts['checkin'].fillna(parts['interview']).fillna(parts['catchup']).fillna('').str.strip()
+    names[_missing(subjects).to_numpy()] = ''
+    return names
 
 
 def fix_excel():
@@ -159,60 +115,53 @@ def fix_excel():
     print(f"  - Rows with 'Unknown' date: {unknown_dates}")
     print(f"  - Rows with missing Subject: {missing_subjects}")
     
+    # Filename parts for every row at once: (date, time) and subject
+    files = df['Transcript File'].astype(str)
+    filename_parts = files.str.extract(_FILENAME_DATETIME_RE)
+    filename_subjects = files.str.extract(_FILENAME_SUBJECT_RE, expand=False).str.strip()
+    for col in ('Date', 'Time'):
+        if col not in df.columns:
+            df[col] = None
+    
     # Fix missing Subject from transcript filename
     print("\n0. Fixing missing Subject from transcript filename...")
-    fixed_subjects = 0
-    for idx, row in df.iterrows():
-        if pd.isna(row.get('Subject')) or row.get('Subject') == '':
-            filename = row.get('Transcript File', '')
-            if filename:
-                # Extract subject from filename like "20251204_154721_Subject Name.vtt"
-                match = re.match(r'\d{8}_\d{6}_(.+)\.vtt', str(filename))
-                if match:
-                    subject = match.group(1).strip()
-                    df.at[idx, 'Subject'] = subject
-                    fixed_subjects += 1
+    # Subject from filename like "20251204_154721_Subject Name.vtt"
+    fix = (df['Subject'].isna() | (df['Subject'] == '')) & filename_subjects.notna()
+    df.loc[fix, 'Subject'] = filename_subjects[fix]
+    fixed_subjects = int(fix.sum())
     print(f"   Fixed {fixed_subjects} subjects")
     
     # Fix dates from filename
     print("\n1. Fixing dates from transcript filenames...")
-    fixed_dates = 0
-    for idx, row in df.iterrows():
-        if row.get('Date') == 'Unknown' or pd.isna(row.get('Date')):
-            filename = row.get('Transcript File', '')
-            new_date = extract_date_from_filename(filename)
-            if new_date:
-                df.at[idx, 'Date'] = new_date
-                fixed_dates += 1
+    new_dates = pd.to_datetime(filename_parts[0], format='%Y%m%d', errors='coerce').dt.strftime('%Y-%m-%d')
+    fix = ((df['Date'] == 'Unknown') | df['Date'].isna()) & new_dates.notna()
+    df.loc[fix, 'Date'] = new_dates[fix]
+    fixed_dates = int(fix.sum())
     print(f"   Fixed {fixed_dates} dates")
     
     # Fix times from filename
     print("\n2. Fixing times from transcript filenames...")
-    fixed_times = 0
-    for idx, row in df.iterrows():
-        if pd.isna(row.get('Time')) or row.get('Time') == '':
-            filename = row.get('Transcript File', '')
-            new_time = extract_time_from_filename(filename)
-            if new_time:
-                df.at[idx, 'Time'] = new_time
-                fixed_times += 1
+    new_times = filename_parts[1].str.replace(r'(\d{2})(\d{2})(\d{2})', r'\1:\2:\3', regex=True)
+    fix = (df['Time'].isna() | (df['Time'] == '')) & new_times.notna()
+    df.loc[fix, 'Time'] = new_times[fix]
+    fixed_times = int(fix.sum())
     print(f"   Fixed {fixed_times} times")
     
     # Add Meeting Type column
     print("\n3. Adding Meeting Type column...")
-    df['Meeting Type'] = df['Subject'].apply(determine_meeting_type)
+    df['Meeting Type'] = determine_meeting_types(df['Subject'])
     type_counts = df['Meeting Type'].value_counts()
     print(f"   Meeting types: {dict(type_counts)}")
     
     # Add HR Person column
     print("\n4. Adding HR Person column...")
-    df['HR Person'] = df['Subject'].apply(extract_hr_person)
+    df['HR Person'] = extract_hr_persons(df['Subject'])
     hr_counts = df['HR Person'].value_counts()
     print(f"   HR persons: {dict(hr_counts)}")
     
     # Add VA Name column
     print("\n5. Adding VA Name column...")
-    df['VA Name'] = df['Subject'].apply(extract_va_name)
+    df['VA Name'] = extract_va_names(df['Subject'])
     va_count = (df['VA Name'] != '').sum()
     print(f"   Extracted {va_count} VA names")
     
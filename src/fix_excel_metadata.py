@@ -4,12 +4,47 @@ Parses the Transcript File name to extract these values.
 """
 import os
 import re
+import shutil
+import calendar
 from pathlib import Path
 from datetime import datetime
 import pandas as pd
 
+try:
+    import xlsxwriter
+    XLSXWRITER_AVAILABLE = True
+except ImportError:
+    XLSXWRITER_AVAILABLE = False
+
 OUTPUT_DIR = Path('output')
 
+# Filename patterns, compiled once for the per-row parse
+_DATE_TIME_REST_RE = re.compile(r'^(\d{8})_(\d{6})_(.+)$')
+_DATE_REST_RE = re.compile(r'^(\d{8})_(.+)$')
+_TRAILING_DATE_RE = re.compile(r'-\d{8}_?\d*$')
+_TRAILING_TIME_RE = re.compile(r'-\d{6}$')
+_TRAILING_NUMBER_RE = re.compile(r'-\d+$')
+_INTERVIEW_RE = re.compile(r'^(Interview)[\s\-:]+(.+)$', re.IGNORECASE)
+_CHECKIN_PATTERNS = [
+    # "Integration Team Check-in  Louise x Joanne" (double space before name)
+    re.compile(r'^(Integration Team Check-in)\s+(\w+)\s+x\s+(.+)$', re.IGNORECASE),
+    # "Check-in Louise x VA"
+    re.compile(r'^(Check-in)\s+(\w+)\s+x\s+(.+)$', re.IGNORECASE),
+    # Any check-in pattern
+    re.compile(r'^(.+Check-in)\s+(\w+)\s+x\s+(.+)$', re.IGNORECASE),
+    # "Integration Team Check-in Shey xAnn" (no space before x)
+    re.compile(r'^(Integration Team Check-in)\s+(\w+)\s*x\s*(\w+)$', re.IGNORECASE),
+]
+
+
+def _iso_date(date_str):
+    """'YYYYMMDD' as 'YYYY-MM-DD' by slicing, or None if it isn't a real calendar date"""
+    year, month, day = int(date_str[:4]), int(date_str[4:6]), int(date_str[6:8])
+    if year < 1 or not 1 <= month <= 12 or not 1 <= day <= calendar.monthrange(year, month)[1]:
+        return None
+    return f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:8]}"
+
+
 def parse_transcript_filename(filename):
     """
     Parse transcript filename to extract metadata.
@@ -32,43 +67,39 @@ def parse_transcript_filename(filename):
     name = filename.replace('.vtt', '')
     
     # Try to extract date and time from start of filename
-    # Pattern 1: 20251106_220053_... (date_time_rest)
-    match1 = re.match(r'^(\d{8})_(\d{6})_(.+)$', name)
-    # Pattern 2: 20251217_... (date_rest, no time)
-    match2 = re.match(r'^(\d{8})_(.+)$', name)
-    
-    if match1:
-        date_str = match1.group(1)
-        time_str = match1.group(2)
-        rest = match1.group(3)
-        
-        # Format date
-        try:
-            result['date'] = datetime.strptime(date_str, '%Y%m%d').strftime('%Y-%m-%d')
-        except:
-            result['date'] = date_str
-            
-        # Format time
-        try:
-            result['time'] = datetime.strptime(time_str, '%H%M%S').strftime('%H:%M:%S')
-        except:
-            result['time'] = time_str
-            
-    elif match2:
-        date_str = match2.group(1)
-        rest = match2.group(2)
-        
-        # Format date
-        try:
-            result['date'] = datetime.strptime(date_str, '%Y%m%d').strftime('%Y-%m-%d')
-        except:
-            result['date'] = date_str
+    date_str = time_str = None
+    # (isdigit() would also pass characters like '²' that int() rejects)
+    if (len(name) > 16 and name[8] == '_' and name[15] == '_' and name[:15].isascii()
+            and name[:8].isdecimal() and name[9:15].isdecimal()):
+        # Pattern 1: 20251106_220053_... (date_time_rest), by far the most
+        # common, so sliced directly rather than matched
+        date_str, time_str, rest = name[:8], name[9:15], name[16:]
     else:
-        rest = name
+        # Pattern 1 on anything the slice check is unsure of
+        match1 = _DATE_TIME_REST_RE.match(name)
+        # Pattern 2: 20251217_... (date_rest, no time)
+        match2 = _DATE_REST_RE.match(name)
+        if match1:
+            date_str, time_str, rest = match1.groups()
+        elif match2:
+            date_str, rest = match2.groups()
+        else:
+            rest = name
+    
+    # Format date and time by slicing the fixed-width digits; values that
+    # aren't a real date or time are kept raw
+    if date_str:
+        result['date'] = _iso_date(date_str) or date_str
+    
+    if time_str:
+        if time_str[:2] <= '23' and time_str[2:4] <= '59' and time_str[4:6] <= '61':
+            result['time'] = f"{time_str[:2]}:{time_str[2:4]}:{time_str[4:6]}"
+        else:
+            result['time'] = time_str
     
     # Clean up the rest - remove trailing date patterns like -20251204 or -20251128_
-    rest = re.sub(r'-\d{8}_?\d*$', '', rest)
-    rest = re.sub(r'-\d{6}$', '', rest)
+    rest = _TRAILING_DATE_RE.sub('', rest)
+    rest = _TRAILING_TIME_RE.sub('', rest)
     
     # Replace underscores with spaces for pattern matching
     rest_spaced = rest.replace('_', ' ')
@@ -79,20 +110,8 @@ def parse_transcript_filename(filename):
     # Try to extract meeting type, HR person, and VA name
     # Pattern: "Integration Team Check-in Louise x VA_Name"
     # Also handles: "Integration Team Check-in  Louise x VA_Name" (double space)
-    
-    checkin_patterns = [
-        # "Integration Team Check-in  Louise x Joanne" (double space before name)
-        r'^(Integration Team Check-in)\s+(\w+)\s+x\s+(.+)$',
-        # "Check-in Louise x VA"
-        r'^(Check-in)\s+(\w+)\s+x\s+(.+)$',
-        # Any check-in pattern
-        r'^(.+Check-in)\s+(\w+)\s+x\s+(.+)$',
-        # "Integration Team Check-in Shey xAnn" (no space before x)
-        r'^(Integration Team Check-in)\s+(\w+)\s*x\s*(\w+)$',
-    ]
-    
-    for pattern in checkin_patterns:
-        match = re.match(pattern, rest_spaced, re.IGNORECASE)
+    for pattern in _CHECKIN_PATTERNS:
+        match = pattern.match(rest_spaced)
         if match:
             result['meeting_type'] = 'Integration Team Check-in'  # Standardize
             result['hr_person'] = match.group(2).strip()
@@ -102,11 +121,11 @@ def parse_transcript_filename(filename):
     # Handle edge case: "Integration Team Check-in  Louise x Joanne-202512" 
     # where the trailing date wasn't fully removed
     if result['va_name']:
-        result['va_name'] = re.sub(r'-\d+$', '', result['va_name']).strip()
+        result['va_name'] = _TRAILING_NUMBER_RE.sub('', result['va_name']).strip()
     
     # If no check-in pattern matched, try interview pattern
     if not result['meeting_type']:
-        interview_match = re.match(r'^(Interview)[\s\-:]+(.+)$', rest_spaced, re.IGNORECASE)
+        interview_match = _INTERVIEW_RE.match(rest_spaced)
         if interview_match:
             result['meeting_type'] = 'Interview'
             result['va_name'] = interview_match.group(2).strip()
@@ -148,62 +167,34 @@ def fix_excel_metadata():
         print("✅ All rows have complete metadata!")
         return
     
-    # Fix each row
-    fixed_count = 0
-    for idx, row in df.iterrows():
-        transcript_file = row.get('Transcript File', '')
-        if not transcript_file or pd.isna(transcript_file):
-            continue
-        
-        # Parse filename
-        metadata = parse_transcript_filename(transcript_file)
-        
-        # Update missing fields
-        updated = False
-        
-        # Date
-        if pd.isna(row.get('Date')) or row.get('Date') == '':
-            if metadata['date']:
-                df.at[idx, 'Date'] = metadata['date']
-                updated = True
-        
-        # Time
-        if pd.isna(row.get('Time')) or row.get('Time') == '':
-            if metadata['time']:
-                df.at[idx, 'Time'] = metadata['time']
-                updated = True
-        
-        # Subject
-        if pd.isna(row.get('Subject')) or row.get('Subject') == '':
-            if metadata['subject']:
-                df.at[idx, 'Subject'] = metadata['subject']
-                updated = True
-        
-        # Meeting Type
-        if pd.isna(row.get('Meeting Type')) or row.get('Meeting Type') == '':
-            if metadata['meeting_type']:
-                df.at[idx, 'Meeting Type'] = metadata['meeting_type']
-                updated = True
-        
-        # HR Person (Organizer for check-ins)
-        if pd.isna(row.get('HR Person')) or row.get('HR Person') == '':
-            if metadata['hr_person']:
-                df.at[idx, 'HR Person'] = metadata['hr_person']
-                updated = True
-        # Also update Organizer if HR Person is found
-        if pd.isna(row.get('Organizer')) or row.get('Organizer') == '':
-            if metadata['hr_person']:
-                df.at[idx, 'Organizer'] = metadata['hr_person']
-                updated = True
-        
-        # VA Name
-        if pd.isna(row.get('VA Name')) or row.get('VA Name') == '':
-            if metadata['va_name']:
-                df.at[idx, 'VA Name'] = metadata['va_name']
-                updated = True
-        
-        if updated:
-            fixed_count += 1
+    # Parse every filename once, then fill each column in one masked assignment
+    files = df['Transcript File']
+    has_file = files.notna() & (files != '')
+    metadata = pd.DataFrame(
+        files[has_file].map(parse_transcript_filename).tolist(),
+        index=files[has_file].index,
+        columns=['date', 'time', 'meeting_type', 'hr_person', 'va_name', 'subject']
+    ).reindex(df.index)
+    
+    # Update missing fields (Organizer also takes the HR person for check-ins)
+    fields = [
+        ('Date', 'date'),
+        ('Time', 'time'),
+        ('Subject', 'subject'),
+        ('Meeting Type', 'meeting_type'),
+        ('HR Person', 'hr_person'),
+        ('Organizer', 'hr_person'),
+        ('VA Name', 'va_name'),
+    ]
+    updated = pd.Series(False, index=df.index)
+    for col, key in fields:
+        current = df[col] if col in df.columns else pd.Series(None, index=df.index, dtype=object)
+        values = metadata[key]
+        fix = (current.isna() | (current == '')) & values.notna() & (values != '')
+        if fix.any():
+            df.loc[fix, col] = values[fix]
+            updated |= fix
+    fixed_count = int(updated.sum())
     
     print(f"✅ Fixed {fixed_count} rows")
     
@@ -230,11 +221,12 @@ def fix_excel_metadata():
     
     # Save
     output_path = OUTPUT_DIR / f'meeting_transcripts_master_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
-    df.to_excel(output_path, index=False)
+    # Serialize once (xlsxwriter is much faster than openpyxl when installed)
+    df.to_excel(output_path, index=False, engine='xlsxwriter' if XLSXWRITER_AVAILABLE else None)
     print(f"💾 Saved to: {output_path}")
     
-    # Also update latest
-    df.to_excel(excel_path, index=False)
+    # Also update latest with a copy of the same file
+    shutil.copyfile(output_path, excel_path)
     print(f"💾 Updated: {excel_path.name}")
     
     # Show sample of fixed data
@@ -0,0 +1,32 @@
+"""
+Phase Output
+============
+stdout proxy shared by the check-in finders so searches running on
+parallel threads can buffer their prints and emit them as one block.
+"""
+
+import io
+import threading
+
+
+class PhaseOutput:
+    """stdout proxy that lets each search thread buffer its own prints"""
+    
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+    
+    def write(self, text):
+        buffer = getattr(self._local, 'buffer', None)
+        return (buffer or self._stream).write(text)
+    
+    def flush(self):
+        self._stream.flush()
+    
+    def capture(self, search):
+        """Run search() with this thread's prints buffered; return (result, output)"""
+        self._local.buffer = io.StringIO()
+        try:
+            return search(), self._local.buffer.getvalue()
+        finally:
+            self._local.buffer = None